@@ -0,0 +1,43 @@
+"""add_validation_queue_and_name_search_indexes
+
+Revision ID: 4d2b8e6f0a13
+Revises: e7a94c1b3d58
+Create Date: 2026-10-15 13:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4d2b8e6f0a13'
+down_revision: Union[str, None] = 'e7a94c1b3d58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_photos_vqueue', 'photos', ['uploaded_at'],
+            unique=False,
+            postgresql_where=sa.text("processing_status = 'ready_for_validation'"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_sharks_display_name_trgm', 'sharks', ['display_name'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={'display_name': 'gin_trgm_ops'},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_sharks_display_name_trgm', table_name='sharks', postgresql_concurrently=True)
+        op.drop_index('ix_photos_vqueue', table_name='photos', postgresql_concurrently=True)
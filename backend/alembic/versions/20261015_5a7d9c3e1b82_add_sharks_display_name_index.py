@@ -0,0 +1,34 @@
+"""add_sharks_display_name_index
+
+Revision ID: 5a7d9c3e1b82
+Revises: 8f3c6a1d2e47
+Create Date: 2026-10-15 16:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a7d9c3e1b82'
+down_revision: Union[str, None] = '8f3c6a1d2e47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        # The trigram GIN index serves ILIKE search; equality lookups
+        # (suggest_name's IN list) and ORDER BY display_name need a btree
+        op.create_index(
+            'ix_sharks_display_name', 'sharks', ['display_name'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_sharks_display_name', table_name='sharks', postgresql_concurrently=True)
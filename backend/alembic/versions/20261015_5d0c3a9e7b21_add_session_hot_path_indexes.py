@@ -0,0 +1,47 @@
+"""add_session_hot_path_indexes
+
+Revision ID: 5d0c3a9e7b21
+Revises: f1a2b3c4d5e6
+Create Date: 2026-10-15 09:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d0c3a9e7b21'
+down_revision: Union[str, None] = 'f1a2b3c4d5e6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_photos_session_status', 'photos', ['dive_session_id'],
+            unique=False,
+            postgresql_where=sa.text("processing_status = 'ready_for_validation'"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_photos_session_uploaded_at', 'photos', ['dive_session_id', 'uploaded_at'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_observations_session_shark', 'observations', ['dive_session_id', 'shark_id'],
+            unique=False,
+            postgresql_where=sa.text('shark_id IS NOT NULL'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_observations_session_shark', table_name='observations', postgresql_concurrently=True)
+        op.drop_index('ix_photos_session_uploaded_at', table_name='photos', postgresql_concurrently=True)
+        op.drop_index('ix_photos_session_status', table_name='photos', postgresql_concurrently=True)
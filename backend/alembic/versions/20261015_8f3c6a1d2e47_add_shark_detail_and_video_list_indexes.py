@@ -0,0 +1,57 @@
+"""add_shark_detail_and_video_list_indexes
+
+Revision ID: 8f3c6a1d2e47
+Revises: 4d2b8e6f0a13
+Create Date: 2026-10-15 14:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f3c6a1d2e47'
+down_revision: Union[str, None] = '4d2b8e6f0a13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        # Matches get_shark's ORDER BY taken_at DESC NULLS LAST; min/max and the
+        # export GROUP BY use it just as well, so it replaces the ascending one
+        op.create_index(
+            'ix_observations_shark_taken_at_desc', 'observations',
+            ['shark_id', sa.text('taken_at DESC NULLS LAST')],
+            unique=False,
+            postgresql_where=sa.text('shark_id IS NOT NULL'),
+            postgresql_concurrently=True,
+        )
+        op.drop_index('ix_observations_shark_taken_at', table_name='observations', postgresql_concurrently=True)
+        op.create_index(
+            'ix_photos_shark_uploaded_at', 'photos', ['shark_id', 'uploaded_at'],
+            unique=False,
+            postgresql_where=sa.text('shark_id IS NOT NULL'),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_videos_session_uploaded_at', 'videos', ['dive_session_id', 'uploaded_at'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_videos_session_uploaded_at', table_name='videos', postgresql_concurrently=True)
+        op.drop_index('ix_photos_shark_uploaded_at', table_name='photos', postgresql_concurrently=True)
+        op.create_index(
+            'ix_observations_shark_taken_at', 'observations', ['shark_id', 'taken_at'],
+            unique=False,
+            postgresql_where=sa.text('shark_id IS NOT NULL'),
+            postgresql_concurrently=True,
+        )
+        op.drop_index('ix_observations_shark_taken_at_desc', table_name='observations', postgresql_concurrently=True)
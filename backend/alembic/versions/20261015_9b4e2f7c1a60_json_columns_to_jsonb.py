@@ -0,0 +1,55 @@
+"""json_columns_to_jsonb
+
+Revision ID: 9b4e2f7c1a60
+Revises: 5d0c3a9e7b21
+Create Date: 2026-10-15 09:30:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b4e2f7c1a60'
+down_revision: Union[str, None] = '5d0c3a9e7b21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_COLUMNS = [
+    ('audit_logs', 'detail'),
+    ('photos', 'exif_payload'),
+    ('photos', 'top5_candidates'),
+    ('photos', 'shark_bbox'),
+    ('photos', 'zone_bbox'),
+]
+
+
+def upgrade() -> None:
+    for table, column in _COLUMNS:
+        # jsonb rejects \u0000, which EXIF string padding can carry in json
+        using = (
+            f"regexp_replace({column}::text, '\\\\u0000', '', 'g')::jsonb"
+            if column == 'exif_payload'
+            else f'{column}::jsonb'
+        )
+        op.alter_column(
+            table, column,
+            type_=postgresql.JSONB(),
+            existing_type=sa.JSON(),
+            existing_nullable=True,
+            postgresql_using=using,
+        )
+
+
+def downgrade() -> None:
+    for table, column in _COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=sa.JSON(),
+            existing_type=postgresql.JSONB(),
+            existing_nullable=True,
+            postgresql_using=f'{column}::json',
+        )
@@ -0,0 +1,33 @@
+"""add_dive_sessions_keyset_index
+
+Revision ID: c3f81d2a6e94
+Revises: 9b4e2f7c1a60
+Create Date: 2026-10-15 10:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f81d2a6e94'
+down_revision: Union[str, None] = '9b4e2f7c1a60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_dive_sessions_started_at_id', 'dive_sessions',
+            [sa.text('started_at DESC'), sa.text('id DESC')],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_dive_sessions_started_at_id', table_name='dive_sessions', postgresql_concurrently=True)
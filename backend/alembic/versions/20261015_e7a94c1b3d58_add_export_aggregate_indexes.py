@@ -0,0 +1,42 @@
+"""add_export_aggregate_indexes
+
+Revision ID: e7a94c1b3d58
+Revises: c3f81d2a6e94
+Create Date: 2026-10-15 12:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a94c1b3d58'
+down_revision: Union[str, None] = 'c3f81d2a6e94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_observations_shark_taken_at', 'observations', ['shark_id', 'taken_at'],
+            unique=False,
+            postgresql_where=sa.text('shark_id IS NOT NULL'),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_photos_session_status_shark', 'photos',
+            ['dive_session_id', 'processing_status', 'shark_id'],
+            unique=False,
+            postgresql_where=sa.text('dive_session_id IS NOT NULL'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_photos_session_status_shark', table_name='photos', postgresql_concurrently=True)
+        op.drop_index('ix_observations_shark_taken_at', table_name='observations', postgresql_concurrently=True)
@@ -0,0 +1,26 @@
+"""add_videos_claimed_at
+
+Revision ID: 2c6e0b9f4d71
+Revises: 5a7d9c3e1b82
+Create Date: 2026-10-16 09:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2c6e0b9f4d71'
+down_revision: Union[str, None] = '5a7d9c3e1b82'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('videos', sa.Column('claimed_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('videos', 'claimed_at')
@@ -1,10 +1,13 @@
+from functools import lru_cache
+from typing import FrozenSet
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 
 from app.auth.jwt import decode_token
+from app.auth.session_cache import CurrentUser, resolve_token
 from app.database import get_db
-from app.models.user import User
 
 bearer = HTTPBearer()
 
@@ -12,29 +15,29 @@ bearer = HTTPBearer()
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(bearer),
     db: Session = Depends(get_db),
-) -> User:
-    email = decode_token(credentials.credentials)
-    if email is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token",
-        )
-    user = db.query(User).filter(User.email == email).first()
+) -> CurrentUser:
+    user = resolve_token(credentials.credentials, db)
     if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-        )
+        # Distinguish a bad token from a deleted account for the client
+        detail = "User not found" if decode_token(credentials.credentials) else "Invalid or expired token"
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=detail)
     return user
 
 
-def require_role(*roles: str):
-    def dep(user: User = Depends(get_current_user)) -> User:
-        if user.role not in roles:
+@lru_cache(maxsize=16)
+def _role_guard(allowed: FrozenSet[str]):
+    def dep(user: CurrentUser = Depends(get_current_user)) -> CurrentUser:
+        if user.role not in allowed:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
         return user
     return dep
 
 
+def require_role(*roles: str):
+    """Dependency allowing only the given roles. The same role set always yields
+    the same callable, so FastAPI de-duplicates it within a request."""
+    return _role_guard(frozenset(roles))
+
+
 require_editor = require_role('editor', 'admin')
 require_admin = require_role('admin')
@@ -1,24 +1,74 @@
+import hashlib
+import threading
+import time
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Optional, Tuple
 
-from jose import JWTError, jwt
+import jwt
+from cachetools import TTLCache
 
 from app.config import settings
 
+# Decoded tokens, keyed by sha256(token) — the raw token is never stored.
+# Valid entries hold (sub, exp); invalid tokens are remembered separately so a
+# flood of bad tokens can't force repeated signature checks.
+_valid_cache: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+_invalid_cache: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+_cache_lock = threading.Lock()
+
+# Key material and algorithm list are fixed for the process lifetime
+_SIGNING_KEY = settings.jwt_secret.encode()
+_ALGORITHMS = [settings.jwt_algorithm]
+
+
+def token_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
 
 def create_access_token(subject: str) -> str:
     expire = datetime.now(timezone.utc) + timedelta(hours=settings.jwt_expiry_hours)
-    return jwt.encode(
-        {"sub": subject, "exp": expire},
-        settings.jwt_secret,
-        algorithm=settings.jwt_algorithm,
-    )
+    return jwt.encode({"sub": subject, "exp": expire}, _SIGNING_KEY, algorithm=settings.jwt_algorithm)
 
 
-def decode_token(token: str) -> Optional[str]:
-    """Return the subject (email) from a valid token, or None if invalid/expired."""
+def _decode(token: str) -> dict:
+    """Verify a token against the precomputed key; raises jwt.PyJWTError."""
+    return jwt.decode(token, _SIGNING_KEY, algorithms=_ALGORITHMS)
+
+
+def decode_claims(token: str) -> Optional[Tuple[str, Optional[int]]]:
+    """Return (sub, exp) from a valid token, or None if invalid/expired."""
+    key = token_key(token)
+    with _cache_lock:
+        if key in _invalid_cache:
+            return None
+        cached = _valid_cache.get(key)
+        if cached is not None:
+            if cached[1] is None or cached[1] > time.time():
+                return cached
+            # Token expired while cached — never hand out a stale subject
+            del _valid_cache[key]
+
     try:
-        payload = jwt.decode(token, settings.jwt_secret, algorithms=[settings.jwt_algorithm])
-        return payload.get("sub")
-    except JWTError:
+        payload = _decode(token)
+    except jwt.PyJWTError:
+        with _cache_lock:
+            _invalid_cache[key] = True
         return None
+
+    claims = (payload.get("sub"), payload.get("exp"))
+    with _cache_lock:
+        _valid_cache[key] = claims
+    return claims
+
+
+def decode_token(token: str) -> Optional[str]:
+    """Return the subject (email) from a valid token, or None if invalid/expired."""
+    claims = decode_claims(token)
+    return claims[0] if claims else None
+
+
+def clear_token_cache() -> None:
+    """Drop all cached decode results."""
+    with _cache_lock:
+        _valid_cache.clear()
+        _invalid_cache.clear()
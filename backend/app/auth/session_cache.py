@@ -0,0 +1,71 @@
+"""Per-token cache of the authenticated user.
+
+One lookup resolves a bearer token to a detached CurrentUser, so the hot
+auth path is a hash + dict probe instead of a JWT decode and a users query.
+"""
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from cachetools import TTLCache
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.auth.jwt import decode_claims, token_key
+from app.models.user import User
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """Detached snapshot of the authenticated user — safe to share across sessions."""
+    id: UUID
+    email: str
+    role: str
+    created_at: datetime
+
+
+# sha256(token) -> (CurrentUser, exp)
+_sessions: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+_lock = threading.Lock()
+
+
+def resolve_token(token: str, db: Session) -> Optional[CurrentUser]:
+    """Return the user a token belongs to, or None if the token is invalid,
+    expired, or its user no longer exists."""
+    key = token_key(token)
+    with _lock:
+        cached = _sessions.get(key)
+        if cached is not None:
+            user, exp = cached
+            if exp is None or exp > time.time():
+                return user
+            del _sessions[key]
+
+    claims = decode_claims(token)
+    if claims is None:
+        return None
+    email, exp = claims
+    row = db.scalars(select(User).where(User.email == email)).first()
+    if row is None:
+        return None
+
+    user = CurrentUser(id=row.id, email=row.email, role=row.role, created_at=row.created_at)
+    with _lock:
+        _sessions[key] = (user, exp)
+    return user
+
+
+def invalidate_user(email: Optional[str] = None) -> None:
+    """Drop cached sessions for one user (or every user when email is None).
+
+    Call after any mutation that changes who a token resolves to or what role it has.
+    """
+    with _lock:
+        if email is None:
+            _sessions.clear()
+            return
+        for key in [k for k, (u, _) in _sessions.items() if u.email == email]:
+            _sessions.pop(key, None)
@@ -1,8 +1,14 @@
+from functools import cached_property, lru_cache
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
     database_url: str
+    db_pool_size: int = 25
+    db_max_overflow: int = 50
+    db_pool_recycle: int = 1800   # seconds; stay under server-side idle timeouts
+    db_pool_timeout: int = 5      # seconds to wait for a connection before 503
     jwt_secret: str
     jwt_algorithm: str = "HS256"
     jwt_expiry_hours: int = 8
@@ -10,11 +16,31 @@ class Settings(BaseSettings):
     minio_root_user: str
     minio_root_password: str
     minio_bucket: str
+    minio_max_pool_connections: int = 64   # keep-alive connections shared by all threads
     ml_service_url: str
+    ml_batch_max_size: int = 8           # photos per /classify-batch call
+    ml_batch_max_latency_ms: int = 50    # how long the first queued photo waits for company
+    # Video job recovery sweep: enable in exactly ONE process (see main.lifespan)
+    video_recovery_enabled: bool = False
+    video_recovery_interval: int = 300    # seconds between sweeps
+    video_pickup_grace: int = 300         # an 'uploaded' video older than this was dropped
+    video_job_timeout: int = 1800         # a 'processing' claim older than this is dead
     photo_base_url: str = ""   # when set, photos served via nginx instead of presigned URLs
+    presigned_url_expiry: int = 3600      # seconds a presigned URL stays valid
+    presigned_url_cache_ttl: int = 3000   # seconds a signed URL is reused; capped below expiry
     cors_origins: str = "http://localhost,http://localhost:3000,http://localhost:5173"
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
+    @cached_property
+    def is_sqlite(self) -> bool:
+        return self.database_url.startswith("sqlite")
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """Build Settings once per process — env and .env are read a single time."""
+    return Settings()
+
 
-settings = Settings()
+settings = get_settings()
@@ -1,10 +1,15 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy import JSON, create_engine, exists, select
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Session, sessionmaker, DeclarativeBase
 
 from app.config import settings
 
-_is_sqlite = settings.database_url.startswith("sqlite")
-_pool_kwargs = {} if _is_sqlite else {"pool_size": 10, "max_overflow": 20}
+_pool_kwargs = {} if settings.is_sqlite else {
+    "pool_size": settings.db_pool_size,
+    "max_overflow": settings.db_max_overflow,
+    "pool_recycle": settings.db_pool_recycle,
+    "pool_timeout": settings.db_pool_timeout,
+}
 
 engine = create_engine(
     settings.database_url,
@@ -18,9 +23,18 @@ class Base(DeclarativeBase):
     pass
 
 
+# Binary JSON on PostgreSQL; plain JSON elsewhere (SQLite in tests)
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+def row_exists(db: Session, model, pk) -> bool:
+    """Primary-key existence check as SELECT EXISTS — no row is loaded or hydrated."""
+    return bool(db.scalar(select(exists().where(model.id == pk))))
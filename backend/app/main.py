@@ -1,27 +1,83 @@
-from fastapi import FastAPI
+import asyncio
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 
 from app.config import settings
 from app.routers import audit_log, auth, dive_sessions, export, locations, observations, photos, sharks, users, videos
+from app.utils.upload import ContentLengthLimit
+
+
+async def _sweep_videos(executor: ThreadPoolExecutor) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        await loop.run_in_executor(executor, videos.resume_pending_videos)
+        await asyncio.sleep(settings.video_recovery_interval)
+
 
-app = FastAPI(title="SharkID API", version="0.1.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Background tasks live in the worker process, so video jobs can be
+    # dropped by a restart. One designated process (VIDEO_RECOVERY_ENABLED)
+    # sweeps for them periodically on its own thread, never the shared pool.
+    if not settings.video_recovery_enabled:
+        yield
+        return
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="video-recovery")
+    sweeper = asyncio.create_task(_sweep_videos(executor))
+    try:
+        yield
+    finally:
+        sweeper.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await sweeper
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+app = FastAPI(title="SharkID API", version="0.1.0", lifespan=lifespan)
+
+# Refuse oversized video uploads from their headers, before the body is
+# received. Added before CORS so the 413 still carries CORS headers.
+app.add_middleware(
+    ContentLengthLimit,
+    path_pattern=videos.UPLOAD_PATH_PATTERN,
+    max_bytes=videos.MAX_VIDEO_BYTES,
+    detail=videos.TOO_LARGE_DETAIL,
+)
+
+# Exact-match origins parsed once; explicit methods/headers let preflight
+# responses be static instead of echoing whatever the client asked for.
+_CORS_ORIGINS = frozenset(o.strip() for o in settings.cors_origins.split(",") if o.strip())
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[o.strip() for o in settings.cors_origins.split(",") if o.strip()],
+    allow_origins=sorted(_CORS_ORIGINS),
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+    allow_headers=["authorization", "content-type"],
+    max_age=600,
 )
 
+
+@app.exception_handler(PoolTimeoutError)
+async def pool_timeout_handler(request: Request, exc: PoolTimeoutError):
+    # Connection pool exhausted — fail fast instead of hanging the request
+    return JSONResponse(status_code=503, content={"detail": "Database busy, try again"})
+
+
 app.include_router(auth.router)
 app.include_router(audit_log.router)
 app.include_router(users.router)
 app.include_router(locations.router)
+app.include_router(export.router)   # before sharks/dive_sessions: /…/export must win over /{id}
 app.include_router(dive_sessions.router)
 app.include_router(photos.router)   # registers /dive-sessions/{id}/photos, /photos/*
 app.include_router(sharks.router)
-app.include_router(export.router)
 app.include_router(observations.router)
 app.include_router(videos.router)
 
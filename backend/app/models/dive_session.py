@@ -1,13 +1,17 @@
 import uuid
 from datetime import datetime
-from typing import Optional
+from typing import TYPE_CHECKING, List, Optional
 
-from sqlalchemy import Text, DateTime, func, ForeignKey
+from sqlalchemy import Text, DateTime, func, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
 
+if TYPE_CHECKING:
+    from app.models.observation import Observation
+    from app.models.photo import Photo
+
 
 class DiveSession(Base):
     __tablename__ = "dive_sessions"
@@ -22,3 +26,18 @@ class DiveSession(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
+
+    __table_args__ = (
+        # Keyset pagination: ORDER BY started_at DESC, id DESC
+        Index("ix_dive_sessions_started_at_id", started_at.desc(), id.desc()),
+    )
+
+    # Read-only collections for eager loading; FK ON DELETE rules own the writes.
+    # lazy="raise": touching one without selectinload() is an error, not a
+    # silent per-row SELECT.
+    photos: Mapped[List["Photo"]] = relationship(
+        viewonly=True, lazy="raise", order_by="Photo.uploaded_at"
+    )
+    observations: Mapped[List["Observation"]] = relationship(
+        viewonly=True, lazy="raise", order_by="Observation.taken_at"
+    )
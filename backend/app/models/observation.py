@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import DateTime, ForeignKey, Text, func
+from sqlalchemy import DateTime, ForeignKey, Index, Text, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -32,3 +32,22 @@ class Observation(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
+
+    __table_args__ = (
+        # Distinct-shark counts per session
+        Index(
+            "ix_observations_session_shark",
+            "dive_session_id",
+            "shark_id",
+            postgresql_where=text("shark_id IS NOT NULL"),
+        ),
+        # Shark detail list (newest first, undated last) and the per-shark
+        # first/last seen and counts in the catalog export (index-only GROUP BY).
+        # NULLS LAST in an index is Postgres-only syntax.
+        Index(
+            "ix_observations_shark_taken_at_desc",
+            "shark_id",
+            text("taken_at DESC NULLS LAST"),
+            postgresql_where=text("shark_id IS NOT NULL"),
+        ).ddl_if(dialect="postgresql"),
+    )
@@ -3,11 +3,11 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Boolean, DateTime, Enum as SAEnum, Float, ForeignKey, Integer, JSON, String, func
+from sqlalchemy import Boolean, DateTime, Enum as SAEnum, Float, ForeignKey, Index, Integer, String, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.database import Base
+from app.database import Base, JSONType
 
 
 class ProcessingStatus(str, enum.Enum):
@@ -30,7 +30,7 @@ class Photo(Base):
     )
 
     # EXIF data
-    exif_payload: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    exif_payload: Mapped[Optional[dict]] = mapped_column(JSONType, nullable=True)
     taken_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     gps_lat: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     gps_lon: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
@@ -42,15 +42,15 @@ class Photo(Base):
         default=ProcessingStatus.uploaded,
     )
     # [{shark_id, display_name, score}, ...] — top-5 candidates from ML
-    top5_candidates: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)
+    top5_candidates: Mapped[Optional[list]] = mapped_column(JSONType, nullable=True)
 
     # User annotation — set via POST /photos/{id}/annotate
     # shark_bbox: {x, y, w, h} normalised 0-1, relative to the full image
     # zone_bbox:  {x, y, w, h} normalised 0-1, relative to the shark crop
     # orientation: "face_left" | "face_right"
     # auto_detected: True while bbox was set by ML and awaits user confirmation
-    shark_bbox: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
-    zone_bbox: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    shark_bbox: Mapped[Optional[dict]] = mapped_column(JSONType, nullable=True)
+    zone_bbox: Mapped[Optional[dict]] = mapped_column(JSONType, nullable=True)
     orientation: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
     auto_detected: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
 
@@ -62,3 +62,35 @@ class Photo(Base):
         UUID(as_uuid=True), ForeignKey("sharks.id", ondelete="SET NULL"), nullable=True
     )
     is_profile_photo: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+
+    __table_args__ = (
+        # Validation-queue counts per session (partial: only queued photos)
+        Index(
+            "ix_photos_session_status",
+            "dive_session_id",
+            postgresql_where=text("processing_status = 'ready_for_validation'"),
+        ),
+        # Session photo grid, ordered by upload time
+        Index("ix_photos_session_uploaded_at", "dive_session_id", "uploaded_at"),
+        # Photo / queue / distinct-shark counts per session in the sessions export
+        Index(
+            "ix_photos_session_status_shark",
+            "dive_session_id",
+            "processing_status",
+            "shark_id",
+            postgresql_where=text("dive_session_id IS NOT NULL"),
+        ),
+        # Shark detail photo list, ordered by upload time
+        Index(
+            "ix_photos_shark_uploaded_at",
+            "shark_id",
+            "uploaded_at",
+            postgresql_where=text("shark_id IS NOT NULL"),
+        ),
+        # Global validation queue, ordered by upload time
+        Index(
+            "ix_photos_vqueue",
+            "uploaded_at",
+            postgresql_where=text("processing_status = 'ready_for_validation'"),
+        ),
+    )
@@ -3,7 +3,7 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import String, DateTime, func, Enum as SAEnum, ForeignKey
+from sqlalchemy import String, DateTime, func, Enum as SAEnum, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -33,3 +33,15 @@ class Shark(Base):
         ForeignKey("photos.id", ondelete="SET NULL", use_alter=True, name="fk_sharks_main_photo"),
         nullable=True,
     )
+
+    __table_args__ = (
+        # Substring name search (ILIKE '%q%') in list_sharks; needs pg_trgm
+        Index(
+            "ix_sharks_display_name_trgm",
+            "display_name",
+            postgresql_using="gin",
+            postgresql_ops={"display_name": "gin_trgm_ops"},
+        ),
+        # Exact-name IN lookups in suggest_name and list_sharks' ORDER BY display_name
+        Index("ix_sharks_display_name", "display_name"),
+    )
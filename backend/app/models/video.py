@@ -3,7 +3,7 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import DateTime, Enum as SAEnum, ForeignKey, Integer, String, func
+from sqlalchemy import DateTime, Enum as SAEnum, ForeignKey, Index, Integer, String, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -33,6 +33,14 @@ class Video(Base):
         default=VideoStatus.uploaded,
     )
     frames_extracted: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # When a worker moved the video to 'processing'; lets startup tell jobs a
+    # previous process was running apart from live ones
+    claimed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     dive_session_id: Mapped[Optional[uuid.UUID]] = mapped_column(
         UUID(as_uuid=True), ForeignKey("dive_sessions.id", ondelete="SET NULL"), nullable=True
     )
+
+    __table_args__ = (
+        # Session video list, newest first (scanned backwards)
+        Index("ix_videos_session_uploaded_at", "dive_session_id", "uploaded_at"),
+    )
@@ -1,7 +1,9 @@
+from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends
+from sqlalchemy import select, tuple_
 from sqlalchemy.orm import Session
 
 from app.auth.dependencies import require_editor
@@ -18,18 +20,21 @@ def get_audit_log(
     resource_type: Optional[str] = None,
     resource_id: Optional[UUID] = None,
     limit: int = 100,
-    offset: int = 0,
+    after_created_at: Optional[datetime] = None,
+    after_id: Optional[UUID] = None,
     db: Session = Depends(get_db),
     _: User = Depends(require_editor),
 ):
-    query = db.query(AuditLog)
+    """Newest first. Pass the last row's created_at/id as the after_* cursor
+    to fetch the next page (keyset pagination — no OFFSET scan)."""
+    stmt = select(AuditLog)
     if resource_type:
-        query = query.filter(AuditLog.resource_type == resource_type)
+        stmt = stmt.where(AuditLog.resource_type == resource_type)
     if resource_id:
-        query = query.filter(AuditLog.resource_id == resource_id)
-    return (
-        query.order_by(AuditLog.created_at.desc())
+        stmt = stmt.where(AuditLog.resource_id == resource_id)
+    if after_created_at is not None and after_id is not None:
+        stmt = stmt.where(tuple_(AuditLog.created_at, AuditLog.id) < tuple_(after_created_at, after_id))
+    return db.scalars(
+        stmt.order_by(AuditLog.created_at.desc(), AuditLog.id.desc())
         .limit(limit)
-        .offset(offset)
-        .all()
-    )
+    ).all()
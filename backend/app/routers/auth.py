@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 
 from app.auth.hashing import verify_password
@@ -8,18 +8,23 @@ from app.database import get_db
 from app.models.audit_log import A
 from app.models.user import User
 from app.schemas.auth import LoginRequest, TokenResponse
-from app.utils.audit import log_event
+from app.utils.audit import client_ip, write_event
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(body: LoginRequest, request: Request, db: Session = Depends(get_db)):
+def login(
+    body: LoginRequest,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
     user = db.query(User).filter(User.email == body.email).first()
     if not user or not verify_password(body.password, user.password_hash):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
-    log_event(db, user, A.AUTH_LOGIN, request=request)
-    db.commit()
+    # Nothing else to commit here — record the login after the response is sent
+    background_tasks.add_task(write_event, user.id, user.email, A.AUTH_LOGIN, ip_address=client_ip(request))
     return TokenResponse(access_token=create_access_token(user.email), role=user.role, email=user.email)
 
 
@@ -1,10 +1,12 @@
 from collections import defaultdict
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
-from sqlalchemy import distinct, func
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from pydantic import TypeAdapter
+from sqlalchemy import distinct, func, literal, select, tuple_, union_all, update
+from sqlalchemy.orm import Session, selectinload
 
 from app.auth.dependencies import get_current_user, require_editor
 from app.database import get_db
@@ -17,10 +19,14 @@ from app.models.user import User
 from app.schemas.dive_session import DiveSessionCreate, DiveSessionDetail, DiveSessionOut, DiveSessionUpdate
 from app.schemas.observation import ObservationOut
 from app.utils.audit import log_event
-from app.utils.photo import enrich_photo, photo_url
+from app.utils.photo import enrich_photos, object_urls
 
 router = APIRouter(prefix="/dive-sessions", tags=["dive-sessions"])
 
+_sessions_adapter = TypeAdapter(List[DiveSessionOut])
+
+_MAX_PAGE_SIZE = 500
+
 
 def _get_or_404(db: Session, session_id: UUID) -> DiveSession:
     s = db.get(DiveSession, session_id)
@@ -33,74 +39,90 @@ def _get_or_404(db: Session, session_id: UUID) -> DiveSession:
 
 @router.get("", response_model=List[DiveSessionOut])
 def list_sessions(
+    limit: Optional[int] = Query(None, ge=1, le=_MAX_PAGE_SIZE),
+    after_started_at: Optional[datetime] = None,
+    after_id: Optional[UUID] = None,
     db: Session = Depends(get_db),
     _: User = Depends(get_current_user),
 ):
-    sessions = db.query(DiveSession).order_by(DiveSession.started_at.desc()).all()
+    """Newest first. Without a limit every session is returned; with one, pass
+    the last row's started_at/id as the after_* cursor to fetch the next page."""
+    if (after_started_at is None) != (after_id is None):
+        raise HTTPException(
+            status_code=422, detail="after_started_at and after_id must be given together"
+        )
+    stmt = select(DiveSession).order_by(DiveSession.started_at.desc(), DiveSession.id.desc())
+    if after_started_at is not None:
+        stmt = stmt.where(
+            tuple_(DiveSession.started_at, DiveSession.id) < tuple_(after_started_at, after_id)
+        )
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    sessions = db.scalars(stmt).all()
     if not sessions:
         return []
 
     session_ids = [s.id for s in sessions]
 
-    # Unique shark count per session
-    shark_counts = dict(
-        db.query(Observation.dive_session_id, func.count(distinct(Observation.shark_id)))
-        .filter(
+    # Unique shark count and validation-queue photo count per session, one round trip
+    counts = union_all(
+        select(
+            Observation.dive_session_id,
+            func.count(distinct(Observation.shark_id)),
+            literal(0),
+        )
+        .where(
             Observation.dive_session_id.in_(session_ids),
             Observation.shark_id.isnot(None),
         )
-        .group_by(Observation.dive_session_id)
-        .all()
-    )
-
-    # Validation-queue photo count per session
-    queue_counts = dict(
-        db.query(Photo.dive_session_id, func.count(Photo.id))
-        .filter(
+        .group_by(Observation.dive_session_id),
+        select(Photo.dive_session_id, literal(0), func.count(Photo.id))
+        .where(
             Photo.dive_session_id.in_(session_ids),
             Photo.processing_status == ProcessingStatus.ready_for_validation,
         )
-        .group_by(Photo.dive_session_id)
-        .all()
+        .group_by(Photo.dive_session_id),
     )
-
-    # Shark thumbnails: up to 5 unique sharks per session via their main photo
-    obs_sharks = (
-        db.query(Observation.dive_session_id, Observation.shark_id)
-        .filter(
+    shark_counts: dict = defaultdict(int)
+    queue_counts: dict = defaultdict(int)
+    for sess_id, n_sharks, n_queue in db.execute(counts):
+        shark_counts[sess_id] += n_sharks
+        queue_counts[sess_id] += n_queue
+
+    # Shark thumbnails: up to 5 unique sharks per session via their main photo.
+    # Ranked in SQL so a session with many sharks ships only its first five rows.
+    session_sharks = (
+        select(Observation.dive_session_id.label("session_id"), Observation.shark_id)
+        .where(
             Observation.dive_session_id.in_(session_ids),
             Observation.shark_id.isnot(None),
         )
         .distinct()
-        .all()
+        .subquery()
     )
-    session_shark_ids: dict = defaultdict(list)
-    for sess_id, shark_id in obs_sharks:
-        if len(session_shark_ids[sess_id]) < 5:
-            session_shark_ids[sess_id].append(shark_id)
-
-    all_shark_ids = list({sid for ids in session_shark_ids.values() for sid in ids})
-    sharks_map = {}
-    if all_shark_ids:
-        sharks_map = {s.id: s for s in db.query(Shark).filter(Shark.id.in_(all_shark_ids)).all()}
-
-    main_photo_ids = [s.main_photo_id for s in sharks_map.values() if s.main_photo_id]
-    photos_map = {}
-    if main_photo_ids:
-        photos_map = {p.id: p for p in db.query(Photo).filter(Photo.id.in_(main_photo_ids)).all()}
-
-    session_thumbs: dict = {}
-    for sess_id, shark_ids in session_shark_ids.items():
-        urls = []
-        for shark_id in shark_ids:
-            shark = sharks_map.get(shark_id)
-            if shark and shark.main_photo_id:
-                photo = photos_map.get(shark.main_photo_id)
-                if photo:
-                    url = photo_url(photo)
-                    if url:
-                        urls.append(url)
-        session_thumbs[sess_id] = urls
+    ranked = select(
+        session_sharks.c.session_id,
+        session_sharks.c.shark_id,
+        func.row_number()
+        .over(partition_by=session_sharks.c.session_id, order_by=session_sharks.c.shark_id)
+        .label("rn"),
+    ).subquery()
+    thumb_rows = db.execute(
+        select(ranked.c.session_id, Photo.object_key)
+        .join(Shark, Shark.id == ranked.c.shark_id)
+        .join(Photo, Photo.id == Shark.main_photo_id)
+        .where(ranked.c.rn <= 5)
+        .order_by(ranked.c.session_id, ranked.c.rn)
+    ).all()
+    thumb_keys: dict = defaultdict(list)
+    for sess_id, object_key in thumb_rows:
+        thumb_keys[sess_id].append(object_key)
+
+    urls = object_urls(key for keys in thumb_keys.values() for key in keys)
+    session_thumbs = {
+        sess_id: [urls[key] for key in keys if key in urls]
+        for sess_id, keys in thumb_keys.items()
+    }
 
     results = []
     for s in sessions:
@@ -109,7 +131,8 @@ def list_sessions(
         out.queue_count = queue_counts.get(s.id, 0)
         out.shark_thumbs = session_thumbs.get(s.id, [])
         results.append(out)
-    return results
+    # Serialise once; returning a Response skips FastAPI's re-validation pass
+    return Response(content=_sessions_adapter.dump_json(results), media_type="application/json")
 
 
 @router.post("", response_model=DiveSessionOut, status_code=status.HTTP_201_CREATED)
@@ -134,19 +157,24 @@ def get_session(
     db: Session = Depends(get_db),
     _: User = Depends(get_current_user),
 ):
-    s = _get_or_404(db, session_id)
-    photos = db.query(Photo).filter(Photo.dive_session_id == session_id).order_by(Photo.uploaded_at).all()
-    observations = (
-        db.query(Observation)
-        .filter(Observation.dive_session_id == session_id)
-        .order_by(Observation.taken_at)
-        .all()
-    )
+    s = db.scalars(
+        select(DiveSession)
+        .options(selectinload(DiveSession.photos), selectinload(DiveSession.observations))
+        .where(DiveSession.id == session_id)
+    ).one_or_none()
+    if s is None:
+        raise HTTPException(status_code=404, detail="Dive session not found")
     detail = DiveSessionDetail.model_validate(s)
-    detail.photos = [enrich_photo(p) for p in photos]
-    detail.observations = [ObservationOut.model_validate(o) for o in observations]
-    detail.photo_count = len(photos)
-    detail.observation_count = len(observations)
+    detail.photos = enrich_photos(s.photos)
+    detail.observations = [ObservationOut.model_validate(o) for o in s.observations]
+    # Both lists are returned in full anyway, so the aggregates come from the
+    # loaded rows rather than extra COUNT queries
+    detail.photo_count = len(s.photos)
+    detail.observation_count = len(s.observations)
+    detail.shark_count = len({o.shark_id for o in s.observations if o.shark_id is not None})
+    detail.queue_count = sum(
+        1 for p in s.photos if p.processing_status == ProcessingStatus.ready_for_validation
+    )
     return detail
 
 
@@ -158,13 +186,23 @@ def update_session(
     db: Session = Depends(get_db),
     current_user: User = Depends(require_editor),
 ):
-    s = _get_or_404(db, session_id)
-    for field, value in body.model_dump(exclude_unset=True).items():
-        setattr(s, field, value)
+    changes = body.model_dump(exclude_unset=True)
+    if changes:
+        # UPDATE ... RETURNING: one round trip instead of SELECT + UPDATE + refresh
+        s = db.execute(
+            update(DiveSession)
+            .where(DiveSession.id == session_id)
+            .values(**changes)
+            .returning(DiveSession)
+        ).scalar_one_or_none()
+        if s is None:
+            raise HTTPException(status_code=404, detail="Dive session not found")
+    else:
+        s = _get_or_404(db, session_id)
+    out = DiveSessionOut.model_validate(s)  # build before commit expires the instance
     log_event(db, current_user, A.SESSION_UPDATE, resource_type="session", resource_id=session_id, request=request)
     db.commit()
-    db.refresh(s)
-    return s
+    return out
 
 
 @router.delete("/{session_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -2,17 +2,26 @@
 Excel export endpoints.
 
 All endpoints require editor+ role and return .xlsx files as streaming responses.
+The bulk catalog/session lists are written as raw SpreadsheetML (app.utils.xlsx);
+per-entity exports use openpyxl's write-only mode. Output is spooled to a temp
+file once it outgrows memory.
 """
 import io
+import tempfile
+import unicodedata
 from datetime import datetime, timezone
-from typing import Optional
+from functools import lru_cache
+from typing import Iterable, Iterator, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Font, NamedStyle, PatternFill
 from openpyxl.utils import get_column_letter
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from app.auth.dependencies import require_editor
@@ -21,71 +30,171 @@ from app.models.dive_session import DiveSession
 from app.models.location import Location
 from app.models.observation import Observation
 from app.models.photo import Photo, ProcessingStatus
-from app.models.shark import Shark
-from app.models.user import User
-from app.utils.photo import photo_url
+from app.models.shark import NameStatus, Shark
+from app.utils.photo import object_urls
+from app.utils.xlsx import Link, write_xlsx
 
-router = APIRouter(tags=["export"])
+# Every export is editor+; resolved once per request at router level
+router = APIRouter(tags=["export"], dependencies=[Depends(require_editor)])
 
 # ── helpers ───────────────────────────────────────────────────────────────────
 
 _HEADER_FILL = PatternFill("solid", fgColor="1B3A5C")
 _HEADER_FONT = Font(bold=True, color="FFFFFF")
 _LINK_FONT   = Font(color="2D7DD2", underline="single")
+_HEADER_ALIGNMENT = Alignment(horizontal="center")
+_HEADER_STYLE_NAME = "export_header"
 
 
-def _make_wb(sheet_title: str):
-    wb = Workbook()
-    ws = wb.active
-    ws.title = sheet_title
-    return wb, ws
+_XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+_SPOOL_MAX = 8 * 1024 * 1024  # larger workbooks spill from RAM to a temp file
+_READ_CHUNK = 64 * 1024
 
 
-def _style_header(ws, headers: list[str]) -> None:
-    ws.append(headers)
-    for col, _ in enumerate(headers, 1):
-        cell = ws.cell(1, col)
-        cell.font = _HEADER_FONT
-        cell.fill = _HEADER_FILL
-        cell.alignment = Alignment(horizontal="center")
+def _header_style() -> NamedStyle:
+    # NamedStyle binds to the workbook it is added to, so build one per workbook;
+    # header cells then share a single styles.xml entry by name.
+    return NamedStyle(
+        _HEADER_STYLE_NAME, font=_HEADER_FONT, fill=_HEADER_FILL, alignment=_HEADER_ALIGNMENT,
+    )
+
+
+def _cell_text(value) -> str:
+    if isinstance(value, Link):
+        return value.label
+    return "" if value is None else str(value)
+
+
+def _write_only_cell(ws, value):
+    if isinstance(value, Link):
+        cell = WriteOnlyCell(ws, value=value.label)
+        cell.hyperlink = value.url
+        cell.font = _LINK_FONT
+        return cell
+    return value
+
+
+def _collect_rows(headers: list[str], rows: Iterable[list]) -> tuple[list[list], list[int]]:
+    """
+    Column widths have to be written before the first row, so the (plain) row
+    values are collected first and the widest value per column is tracked in
+    the same pass. Returns (rows, column widths).
+    """
+    widths = [len(h) for h in headers]
+    buffered = []
+    for row in rows:
+        for j, value in enumerate(row):
+            n = len(_cell_text(value))
+            if n > widths[j]:
+                widths[j] = n
+        buffered.append(row)
+    return buffered, [min(w + 4, 60) for w in widths]
+
+
+def _build_workbook(sheet_title: str, headers: list[str], rows: Iterable[list]) -> Workbook:
+    """
+    Write-only workbook: cells are serialized as rows are appended instead of
+    being kept as a full in-memory sheet.
+    """
+    buffered, widths = _collect_rows(headers, rows)
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_title)
     ws.freeze_panes = "A2"
+    for j, width in enumerate(widths, 1):
+        ws.column_dimensions[get_column_letter(j)].width = width
 
+    wb.add_named_style(_header_style())
+    header_cells = []
+    for h in headers:
+        cell = WriteOnlyCell(ws, value=h)
+        cell.style = _HEADER_STYLE_NAME
+        header_cells.append(cell)
+    ws.append(header_cells)
 
-def _autofit(ws) -> None:
-    for col in ws.columns:
-        max_len = max((len(str(c.value or "")) for c in col), default=10)
-        ws.column_dimensions[get_column_letter(col[0].column)].width = min(max_len + 4, 60)
+    for row in buffered:
+        ws.append([_write_only_cell(ws, v) for v in row])
+    return wb
 
 
-def _hyperlink_cell(ws, row: int, col: int, url: str, label: str = "Open") -> None:
-    cell = ws.cell(row=row, column=col)
-    cell.value = label
-    cell.hyperlink = url
-    cell.font = _LINK_FONT
+# ASCII alphanumerics pass through, every other ASCII char becomes "_"
+_SAFE_FILENAME = {i: chr(i) if chr(i).isalnum() else "_" for i in range(128)}
 
 
-def _fmt_dt(dt: Optional[datetime]) -> str:
-    if dt is None:
-        return ""
+def _safe_filename(name: str) -> str:
+    # Fold accents to ASCII first so the Content-Disposition header stays latin-1 safe
+    ascii_name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode()
+    return ascii_name.translate(_SAFE_FILENAME)
+
+
+@lru_cache(maxsize=8192)  # timestamps repeat across rows of the same session
+def _fmt_utc(dt: datetime) -> str:
     return dt.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
 
 
-def _xlsx_response(wb: Workbook, filename: str) -> StreamingResponse:
-    buf = io.BytesIO()
-    wb.save(buf)
-    buf.seek(0)
+def _fmt_dt(dt: Optional[datetime]) -> str:
+    return "" if dt is None else _fmt_utc(dt)
+
+
+def _iter_file(f) -> Iterator[bytes]:
+    try:
+        while chunk := f.read(_READ_CHUNK):
+            yield chunk
+    finally:
+        f.close()
+
+
+def _file_response(tmp, filename: str) -> StreamingResponse:
+    """
+    Stream a finished spool file back. Like FileResponse, the size is known, so
+    Content-Length is sent instead of chunked encoding; the background task
+    closes the file even if the body iterator is never started.
+    """
+    size = tmp.seek(0, io.SEEK_END)
+    tmp.seek(0)
     return StreamingResponse(
-        buf,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        _iter_file(tmp),
+        media_type=_XLSX_MEDIA_TYPE,
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Content-Length": str(size),
+        },
+        background=BackgroundTask(tmp.close),
     )
 
 
-def _location_name(db: Session, location_id: Optional[UUID]) -> str:
-    if location_id is None:
-        return ""
-    loc = db.get(Location, location_id)
-    return f"{loc.spot_name}, {loc.country}" if loc else ""
+def _xlsx_response(wb: Workbook, filename: str) -> StreamingResponse:
+    tmp = tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX, suffix=".xlsx")
+    wb.save(tmp)
+    return _file_response(tmp, filename)
+
+
+def _flat_xlsx_response(
+    sheet_title: str, headers: list[str], widths: list[float], rows: Iterable[list], filename: str,
+) -> StreamingResponse:
+    """
+    Bulk exports: skip openpyxl and emit the sheet XML directly. Column widths
+    are fixed per export, so `rows` (typically a generator over a streamed
+    query) goes straight into the writer without being buffered.
+    """
+    tmp = tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX, suffix=".xlsx")
+    write_xlsx(tmp, sheet_title, headers, rows, widths)
+    return _file_response(tmp, filename)
+
+
+# Enum member -> value, resolved once instead of via Enum.value per row
+_NAME_STATUS = {m: m.value for m in NameStatus}
+_PROCESSING_STATUS = {m: m.value for m in ProcessingStatus}
+
+_YIELD_PER = 1000  # rows per fetch for streamed (server-side cursor) queries
+
+
+def _location_names(db: Session) -> dict[UUID, str]:
+    """All locations as {id: "spot, country"} — one column-only query."""
+    return {
+        loc_id: f"{spot_name}, {country}"
+        for loc_id, spot_name, country in db.query(Location.id, Location.spot_name, Location.country)
+    }
 
 
 # ── shark catalog ─────────────────────────────────────────────────────────────
@@ -93,51 +202,57 @@ def _location_name(db: Session, location_id: Optional[UUID]) -> str:
 @router.get("/sharks/export")
 def export_sharks(
     db: Session = Depends(get_db),
-    _: User = Depends(require_editor),
 ):
     """Export the full shark catalog as Excel."""
-    sharks = db.query(Shark).order_by(Shark.created_at).all()
-
-    # Precompute first/last seen per shark from observations
-    obs_all = db.query(Observation).filter(Observation.shark_id.isnot(None)).all()
+    # First/last seen and observation count per shark, aggregated in SQL
     first_seen: dict[UUID, datetime] = {}
     last_seen:  dict[UUID, datetime] = {}
-    for obs in obs_all:
-        sid = obs.shark_id
-        if obs.taken_at:
-            if sid not in first_seen or obs.taken_at < first_seen[sid]:
-                first_seen[sid] = obs.taken_at
-            if sid not in last_seen or obs.taken_at > last_seen[sid]:
-                last_seen[sid] = obs.taken_at
-
-    obs_count: dict[UUID, int] = {}
-    for obs in obs_all:
-        obs_count[obs.shark_id] = obs_count.get(obs.shark_id, 0) + 1
-
-    wb, ws = _make_wb("Shark Catalog")
+    obs_count:  dict[UUID, int] = {}
+    for sid, first, last, count in (
+        db.query(
+            Observation.shark_id,
+            func.min(Observation.taken_at),
+            func.max(Observation.taken_at),
+            func.count(Observation.id),
+        )
+        .filter(Observation.shark_id.isnot(None))
+        .group_by(Observation.shark_id)
+        .yield_per(_YIELD_PER)
+    ):
+        first_seen[sid] = first
+        last_seen[sid] = last
+        obs_count[sid] = count
+
     headers = ["Name", "Status", "First Seen", "Last Seen", "Observations", "Added", "Main Photo"]
-    _style_header(ws, headers)
-
-    for i, shark in enumerate(sharks, 2):
-        main_url = None
-        if shark.main_photo_id:
-            mp = db.get(Photo, shark.main_photo_id)
-            if mp:
-                main_url = photo_url(mp)
-
-        ws.cell(i, 1, shark.display_name)
-        ws.cell(i, 2, shark.name_status.value)
-        ws.cell(i, 3, _fmt_dt(first_seen.get(shark.id)))
-        ws.cell(i, 4, _fmt_dt(last_seen.get(shark.id)))
-        ws.cell(i, 5, obs_count.get(shark.id, 0))
-        ws.cell(i, 6, _fmt_dt(shark.created_at))
-        if main_url:
-            _hyperlink_cell(ws, i, 7, main_url, "Photo")
-        else:
-            ws.cell(i, 7, "")
-
-    _autofit(ws)
-    return _xlsx_response(wb, "sharks.xlsx")
+    widths = [30, 13, 24, 24, 16, 24, 14]
+
+    # Column tuples only, with the main photo's key joined in; streamed in
+    # batches so each batch's URLs are signed in one object_urls() call
+    sharks = db.execute(
+        select(
+            Shark.id, Shark.display_name, Shark.name_status, Shark.created_at, Photo.object_key,
+        )
+        .outerjoin(Photo, Photo.id == Shark.main_photo_id)
+        .order_by(Shark.created_at)
+        .execution_options(yield_per=_YIELD_PER)
+    )
+
+    def rows():
+        for batch in sharks.partitions():
+            urls = object_urls(s.object_key for s in batch if s.object_key)
+            for shark in batch:
+                main_url = urls.get(shark.object_key)
+                yield [
+                    shark.display_name,
+                    _NAME_STATUS[shark.name_status],
+                    _fmt_dt(first_seen.get(shark.id)),
+                    _fmt_dt(last_seen.get(shark.id)),
+                    obs_count.get(shark.id, 0),
+                    _fmt_dt(shark.created_at),
+                    Link(main_url, "Photo") if main_url else "",
+                ]
+
+    return _flat_xlsx_response("Shark Catalog", headers, widths, rows(), "sharks.xlsx")
 
 
 # ── shark detail ──────────────────────────────────────────────────────────────
@@ -146,53 +261,63 @@ def export_sharks(
 def export_shark_detail(
     shark_id: UUID,
     db: Session = Depends(get_db),
-    _: User = Depends(require_editor),
 ):
     """Export a single shark's observations with linked photos and GPS data."""
     shark = db.get(Shark, shark_id)
     if not shark:
         raise HTTPException(status_code=404, detail="Shark not found")
 
+    # Each observation arrives with its photo's columns in one joined query
     observations = (
-        db.query(Observation)
+        db.query(
+            Observation.taken_at,
+            Observation.location_id,
+            Observation.dive_session_id,
+            Observation.comment,
+            Observation.confirmed_at,
+            Photo.object_key,
+            Photo.taken_at.label("photo_taken_at"),
+            Photo.gps_lat,
+            Photo.gps_lon,
+        )
+        .outerjoin(Photo, Photo.id == Observation.photo_id)
         .filter(Observation.shark_id == shark_id)
         .order_by(Observation.taken_at)
         .all()
     )
 
-    wb, ws = _make_wb(shark.display_name[:31])  # sheet name max 31 chars
     headers = [
         "Date", "Location", "Session ID", "Comment", "Confirmed",
         "Photo", "Photo Taken At", "GPS Lat", "GPS Lon",
     ]
-    _style_header(ws, headers)
 
-    for i, obs in enumerate(observations, 2):
-        loc_name = _location_name(db, obs.location_id)
+    urls = object_urls(o.object_key for o in observations if o.object_key)
+    locations = _location_names(db)
+
+    rows = []
+    for obs in observations:
+        loc_name = locations.get(obs.location_id, "")
         confirmed = "Yes" if obs.confirmed_at else "No"
 
-        photo: Optional[Photo] = db.get(Photo, obs.photo_id) if obs.photo_id else None
-        url = photo_url(photo) if photo else None
-        taken_at = _fmt_dt(photo.taken_at if photo else None)
-        gps_lat = photo.gps_lat if photo else None
-        gps_lon = photo.gps_lon if photo else None
-
-        ws.cell(i, 1, _fmt_dt(obs.taken_at))
-        ws.cell(i, 2, loc_name)
-        ws.cell(i, 3, str(obs.dive_session_id) if obs.dive_session_id else "")
-        ws.cell(i, 4, obs.comment or "")
-        ws.cell(i, 5, confirmed)
-        if url:
-            _hyperlink_cell(ws, i, 6, url, "Photo")
-        else:
-            ws.cell(i, 6, "")
-        ws.cell(i, 7, taken_at)
-        ws.cell(i, 8, gps_lat or "")
-        ws.cell(i, 9, gps_lon or "")
-
-    _autofit(ws)
-    safe_name = "".join(c if c.isalnum() else "_" for c in shark.display_name)
-    return _xlsx_response(wb, f"shark_{safe_name}.xlsx")
+        url = urls.get(obs.object_key)
+        taken_at = _fmt_dt(obs.photo_taken_at)
+        gps_lat = obs.gps_lat
+        gps_lon = obs.gps_lon
+
+        rows.append([
+            _fmt_dt(obs.taken_at),
+            loc_name,
+            str(obs.dive_session_id) if obs.dive_session_id else "",
+            obs.comment or "",
+            confirmed,
+            Link(url, "Photo") if url else "",
+            taken_at,
+            gps_lat or "",
+            gps_lon or "",
+        ])
+
+    wb = _build_workbook(shark.display_name[:31], headers, rows)  # sheet name max 31 chars
+    return _xlsx_response(wb, f"shark_{_safe_filename(shark.display_name)}.xlsx")
 
 
 # ── sessions list ─────────────────────────────────────────────────────────────
@@ -200,45 +325,54 @@ def export_shark_detail(
 @router.get("/dive-sessions/export")
 def export_sessions(
     db: Session = Depends(get_db),
-    _: User = Depends(require_editor),
 ):
     """Export the full dive sessions list as Excel."""
-    sessions = db.query(DiveSession).order_by(DiveSession.started_at.desc()).all()
+    # Photo / queue / distinct-shark counts per session, aggregated in SQL
+    counts: dict[UUID, tuple[int, int, int]] = {
+        sid: (photos, queued, sharks)
+        for sid, photos, queued, sharks in (
+            db.query(
+                Photo.dive_session_id,
+                func.count(Photo.id),
+                func.count(Photo.id).filter(
+                    Photo.processing_status == ProcessingStatus.ready_for_validation
+                ),
+                func.count(Photo.shark_id.distinct()),
+            )
+            .filter(Photo.dive_session_id.isnot(None))
+            .group_by(Photo.dive_session_id)
+        )
+    }
 
-    # Counts per session
-    photos_q = (
-        db.query(Photo.dive_session_id, Photo.id, Photo.processing_status, Photo.shark_id)
-        .filter(Photo.dive_session_id.isnot(None))
-        .all()
-    )
-    photo_count:  dict[UUID, int] = {}
-    queue_count:  dict[UUID, int] = {}
-    shark_ids_per_session: dict[UUID, set] = {}
-    for p in photos_q:
-        sid = p.dive_session_id
-        photo_count[sid] = photo_count.get(sid, 0) + 1
-        if p.processing_status == ProcessingStatus.ready_for_validation:
-            queue_count[sid] = queue_count.get(sid, 0) + 1
-        if p.shark_id:
-            shark_ids_per_session.setdefault(sid, set()).add(p.shark_id)
-
-    wb, ws = _make_wb("Dive Sessions")
     headers = ["Started", "Ended", "Location", "Comment", "Photos", "Queue", "Sharks"]
-    _style_header(ws, headers)
+    widths = [24, 24, 40, 60, 10, 10, 10]
+
+    locations = _location_names(db)
+    sessions = (
+        db.query(
+            DiveSession.id,
+            DiveSession.started_at,
+            DiveSession.ended_at,
+            DiveSession.location_id,
+            DiveSession.comment,
+        )
+        .order_by(DiveSession.started_at.desc())
+        .yield_per(_YIELD_PER)
+    )
 
-    for i, session in enumerate(sessions, 2):
-        loc_name = _location_name(db, session.location_id)
-        sid = session.id
-        ws.cell(i, 1, _fmt_dt(session.started_at))
-        ws.cell(i, 2, _fmt_dt(session.ended_at))
-        ws.cell(i, 3, loc_name)
-        ws.cell(i, 4, session.comment or "")
-        ws.cell(i, 5, photo_count.get(sid, 0))
-        ws.cell(i, 6, queue_count.get(sid, 0))
-        ws.cell(i, 7, len(shark_ids_per_session.get(sid, set())))
+    # Rows are generated as the cursor is read and written out one by one
+    rows = (
+        [
+            _fmt_dt(session.started_at),
+            _fmt_dt(session.ended_at),
+            locations.get(session.location_id, ""),
+            session.comment or "",
+            *counts.get(session.id, (0, 0, 0)),
+        ]
+        for session in sessions
+    )
 
-    _autofit(ws)
-    return _xlsx_response(wb, "dive_sessions.xlsx")
+    return _flat_xlsx_response("Dive Sessions", headers, widths, rows, "dive_sessions.xlsx")
 
 
 # ── session detail ────────────────────────────────────────────────────────────
@@ -247,57 +381,64 @@ def export_sessions(
 def export_session_detail(
     session_id: UUID,
     db: Session = Depends(get_db),
-    _: User = Depends(require_editor),
 ):
     """Export all photos from a single dive session."""
     session = db.get(DiveSession, session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Dive session not found")
 
+    # Each photo arrives with its shark's name in one joined query
     photos = (
-        db.query(Photo)
+        db.query(
+            Photo.id,
+            Photo.object_key,
+            Photo.processing_status,
+            Photo.taken_at,
+            Photo.gps_lat,
+            Photo.gps_lon,
+            Photo.orientation,
+            Shark.display_name.label("shark_name"),
+        )
+        .outerjoin(Shark, Shark.id == Photo.shark_id)
         .filter(Photo.dive_session_id == session_id)
         .order_by(Photo.uploaded_at)
         .all()
     )
 
-    # Observation lookup by photo_id
-    obs_by_photo: dict[UUID, Observation] = {}
-    for obs in db.query(Observation).filter(Observation.dive_session_id == session_id).all():
-        if obs.photo_id:
-            obs_by_photo[obs.photo_id] = obs
+    # Observation confirmed_at by photo_id
+    confirmed_by_photo: dict[UUID, Optional[datetime]] = dict(
+        db.query(Observation.photo_id, Observation.confirmed_at)
+        .filter(Observation.dive_session_id == session_id, Observation.photo_id.isnot(None))
+        .all()
+    )
 
-    wb, ws = _make_wb("Photos")
     headers = [
         "Photo", "Status", "Shark", "Taken At",
         "GPS Lat", "GPS Lon", "Orientation", "Observation",
     ]
-    _style_header(ws, headers)
 
-    for i, photo in enumerate(photos, 2):
-        url = photo_url(photo)
-        shark_name = ""
-        if photo.shark_id:
-            s = db.get(Shark, photo.shark_id)
-            shark_name = s.display_name if s else ""
+    urls = object_urls(p.object_key for p in photos)
+
+    rows = []
+    for photo in photos:
+        url = urls.get(photo.object_key)
+        shark_name = photo.shark_name or ""
 
-        obs = obs_by_photo.get(photo.id)
         obs_confirmed = ""
-        if obs:
-            obs_confirmed = "Confirmed" if obs.confirmed_at else "Draft"
-
-        if url:
-            _hyperlink_cell(ws, i, 1, url, "Photo")
-        else:
-            ws.cell(i, 1, "")
-        ws.cell(i, 2, photo.processing_status.value)
-        ws.cell(i, 3, shark_name)
-        ws.cell(i, 4, _fmt_dt(photo.taken_at))
-        ws.cell(i, 5, photo.gps_lat or "")
-        ws.cell(i, 6, photo.gps_lon or "")
-        ws.cell(i, 7, photo.orientation or "")
-        ws.cell(i, 8, obs_confirmed)
-
-    _autofit(ws)
+        if photo.id in confirmed_by_photo:
+            obs_confirmed = "Confirmed" if confirmed_by_photo[photo.id] else "Draft"
+
+        rows.append([
+            Link(url, "Photo") if url else "",
+            _PROCESSING_STATUS[photo.processing_status],
+            shark_name,
+            _fmt_dt(photo.taken_at),
+            photo.gps_lat or "",
+            photo.gps_lon or "",
+            photo.orientation or "",
+            obs_confirmed,
+        ])
+
+    wb = _build_workbook("Photos", headers, rows)
     date_str = session.started_at.strftime("%Y-%m-%d")
     return _xlsx_response(wb, f"session_{date_str}.xlsx")
@@ -5,7 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 
 from app.auth.dependencies import get_current_user, require_editor
-from app.database import get_db
+from app.database import get_db, row_exists
 from app.models.audit_log import A
 from app.models.dive_session import DiveSession
 from app.models.location import Location
@@ -59,11 +59,11 @@ def update_observation(
         raise HTTPException(status_code=409, detail="Confirmed observations cannot be edited")
 
     # M5: validate foreign keys before applying changes
-    if body.shark_id is not None and not db.get(Shark, body.shark_id):
+    if body.shark_id is not None and not row_exists(db, Shark, body.shark_id):
         raise HTTPException(status_code=404, detail="Shark not found")
-    if body.location_id is not None and not db.get(Location, body.location_id):
+    if body.location_id is not None and not row_exists(db, Location, body.location_id):
         raise HTTPException(status_code=404, detail="Location not found")
-    if body.dive_session_id is not None and not db.get(DiveSession, body.dive_session_id):
+    if body.dive_session_id is not None and not row_exists(db, DiveSession, body.dive_session_id):
         raise HTTPException(status_code=404, detail="Dive session not found")
 
     for field, value in body.model_dump(exclude_unset=True, exclude={"confirm"}).items():
@@ -1,40 +1,93 @@
+import asyncio
 import io
 import logging
+import threading
 import uuid
 from datetime import datetime, timezone
-from typing import List
+from typing import List, NamedTuple, Optional
 from uuid import UUID
 
 import httpx
+from botocore.exceptions import BotoCoreError, ClientError
+from cachetools import TTLCache
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, UploadFile, status
+from fastapi.concurrency import iterate_in_threadpool, run_in_threadpool
 from PIL import Image
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, defer
 
 from app.auth.dependencies import get_current_user, require_admin, require_editor
 from app.config import settings
-from app.database import SessionLocal, get_db
+from app.database import SessionLocal, get_db, row_exists
 from app.models.audit_log import A, AuditLog
 from app.models.dive_session import DiveSession
 from app.models.observation import Observation
 from app.models.photo import Photo, ProcessingStatus
 from app.models.shark import NameStatus, Shark
 from app.models.user import User
-from app.schemas.photo import AnnotateRequest, PhotoOut, ValidateRequest
-from app.storage.minio import delete_file, get_object_bytes, upload_file
+from app.schemas.photo import AnnotateRequest, PhotoOut, QueueCount, ValidateRequest
+from app.storage.minio import delete_file, get_object_bytes, iter_object, upload_file
+from app.utils import ml_batch
 from app.utils.audit import log_event
-from app.utils.exif import extract_exif, parse_gps, parse_taken_at
-from app.utils.photo import enrich_photo
+from app.utils.exif import exif_from_image, parse_gps, parse_taken_at
+from app.utils.photo import enrich_photo, enrich_photos
+from app.utils.upload import read_limited
 
 logger = logging.getLogger(__name__)
 
-ALLOWED_CONTENT_TYPES = {"image/jpeg", "image/png"}
+# Accepted content types and the object-key extension stored for each
+PHOTO_EXTENSIONS = {"image/jpeg": "jpg", "image/png": "png"}
+ALLOWED_CONTENT_TYPES = frozenset(PHOTO_EXTENSIONS)
+# Leading signature bytes and PIL format name per accepted content type
+_IMAGE_SIGNATURES = {
+    "image/jpeg": (b"\xff\xd8\xff", "JPEG"),
+    "image/png": (b"\x89PNG\r\n\x1a\n", "PNG"),
+}
 MAX_PHOTO_BYTES = 50 * 1024 * 1024  # 50 MB
 
 router = APIRouter(tags=["photos"])
 
+_ml_http_instance: Optional[httpx.Client] = None
+_ml_http_lock = threading.Lock()
+
+# Validation-queue badge count, shared by all pollers of this worker
+_queue_count_cache: TTLCache = TTLCache(maxsize=1, ttl=2)
+_queue_count_lock = threading.Lock()
+
 
 # ── helpers ──────────────────────────────────────────────────────────────────
 
+def _ml_http() -> httpx.Client:
+    """Shared client for the synchronous ML calls made from request handlers,
+    so they reuse keep-alive connections instead of reconnecting per call."""
+    global _ml_http_instance
+    if _ml_http_instance is None:
+        with _ml_http_lock:
+            if _ml_http_instance is None:
+                _ml_http_instance = httpx.Client(
+                    limits=httpx.Limits(max_keepalive_connections=50),
+                )
+    return _ml_http_instance
+
+
+def _inspect_image(data: bytes, content_type: str) -> Optional[dict]:
+    """Return the image's EXIF dict, or None if it is not a valid image.
+
+    Checks the signature and parses the header only; the full decode is left
+    to the ML service. EXIF is read from the same opened image.
+    """
+    magic, fmt = _IMAGE_SIGNATURES[content_type]
+    if not data.startswith(magic):
+        return None
+    try:
+        img = Image.open(io.BytesIO(data))
+    except Exception:
+        return None
+    if img.format != fmt or not all(img.size):
+        return None
+    return exif_from_image(img)
+
+
 def _get_photo_or_404(db: Session, photo_id: UUID) -> Photo:
     photo = db.get(Photo, photo_id)
     if not photo:
@@ -44,81 +97,137 @@ def _get_photo_or_404(db: Session, photo_id: UUID) -> Photo:
 
 # ── background classification task ───────────────────────────────────────────
 
-def _classify_photo(photo_id: UUID) -> None:
-    """
-    Fetch image from MinIO, call ML service, update photo record.
-    Runs in FastAPI's thread pool via BackgroundTasks.
-    """
+class _MlJob(NamedTuple):
+    """Photo fields an ML call needs; the image itself is streamed from object_key."""
+    object_key: str
+    content_type: str
+    shark_bbox: Optional[dict]
+    zone_bbox: Optional[dict]
+    orientation: Optional[str]
+
+
+def _load_ml_job(photo_id: UUID, mark_processing: bool = False) -> Optional[_MlJob]:
+    """Thread-pool side: read the photo, optionally flagging it as processing."""
     db = SessionLocal()
     try:
         photo = db.get(Photo, photo_id)
         if not photo:
-            return
+            return None
+        if mark_processing:
+            photo.processing_status = ProcessingStatus.processing
+            db.commit()
+        return _MlJob(
+            object_key=photo.object_key,
+            content_type=photo.content_type,
+            shark_bbox=photo.shark_bbox,
+            zone_bbox=photo.zone_bbox,
+            orientation=photo.orientation,
+        )
+    finally:
+        db.close()
 
-        photo.processing_status = ProcessingStatus.processing
-        db.commit()
 
-        image_data = get_object_bytes(photo.object_key)
+def _update_photo(photo_id: UUID, **fields) -> None:
+    """Thread-pool side: set fields on a photo in a fresh session and commit."""
+    db = SessionLocal()
+    try:
+        photo = db.get(Photo, photo_id)
+        if photo:
+            for field, value in fields.items():
+                setattr(photo, field, value)
+            db.commit()
+    finally:
+        db.close()
 
-        with httpx.Client(timeout=30.0) as http:
-            # Step 1: auto-detect bboxes when no annotation exists yet
-            if not photo.shark_bbox or not photo.zone_bbox:
-                det = http.post(
-                    f"{settings.ml_service_url}/detect",
-                    content=image_data,
-                    headers={"Content-Type": photo.content_type},
-                )
+
+def _classify_params(
+    shark_bbox: Optional[dict], zone_bbox: Optional[dict], orientation: Optional[str]
+) -> dict:
+    """Query params for /classify. shark_bbox is passed alone when zone_bbox is
+    missing — ML then applies an orientation-aware auto-zone heuristic
+    instead of detect_snout."""
+    params: dict = {}
+    if shark_bbox:
+        sb = shark_bbox
+        params = {
+            "shark_x": sb["x"], "shark_y": sb["y"],
+            "shark_w": sb["w"], "shark_h": sb["h"],
+        }
+        if zone_bbox:
+            zb = zone_bbox
+            params.update({
+                "zone_x": zb["x"], "zone_y": zb["y"],
+                "zone_w": zb["w"], "zone_h": zb["h"],
+            })
+    if orientation:
+        params["orientation"] = orientation
+    return params
+
+
+async def _classify_photo(photo_id: UUID, image: Optional[bytes] = None) -> None:
+    """
+    Fetch image from MinIO (unless the caller still holds its bytes), call ML
+    service, update photo record.
+    DB and MinIO work runs in the thread pool; the ML round-trips are awaited
+    on the event loop, so no worker thread is held while the model runs.
+    """
+    try:
+        job = await run_in_threadpool(_load_ml_job, photo_id, True)
+        if job is None:
+            return
+        shark_bbox, zone_bbox = job.shark_bbox, job.zone_bbox
+        if image is None:
+            # Buffered, not streamed: the same bytes go to /detect and to
+            # /classify (twice when detection finds boxes).
+            image = await run_in_threadpool(get_object_bytes, job.object_key)
+
+        # Classify with the current bboxes straight away (micro-batched with
+        # other photos). If /detect runs and finds both boxes, this
+        # speculative result is dropped and classification is redone.
+        classify = asyncio.ensure_future(ml_batch.classify(
+            image, job.content_type, _classify_params(shark_bbox, zone_bbox, job.orientation)
+        ))
+        try:
+            # Auto-detect bboxes when no annotation exists yet
+            if not shark_bbox or not zone_bbox:
+                async with httpx.AsyncClient(timeout=30.0) as http:
+                    det = await http.post(
+                        f"{settings.ml_service_url}/detect",
+                        content=image,
+                        headers={"Content-Type": job.content_type},
+                    )
                 detected = det.json()
                 if detected.get("shark_bbox") and detected.get("zone_bbox"):
-                    photo.shark_bbox = detected["shark_bbox"]
-                    photo.zone_bbox = detected["zone_bbox"]
-                    photo.auto_detected = True
-                    db.commit()
-
-            # Step 2: classify using bboxes (auto-detected or user-annotated)
-            # Pass shark_bbox alone when zone_bbox is missing — ML will apply
-            # an orientation-aware auto-zone heuristic instead of detect_snout.
-            ml_params: dict = {}
-            if photo.shark_bbox:
-                sb = photo.shark_bbox
-                ml_params = {
-                    "shark_x": sb["x"], "shark_y": sb["y"],
-                    "shark_w": sb["w"], "shark_h": sb["h"],
-                }
-                if photo.zone_bbox:
-                    zb = photo.zone_bbox
-                    ml_params.update({
-                        "zone_x": zb["x"], "zone_y": zb["y"],
-                        "zone_w": zb["w"], "zone_h": zb["h"],
-                    })
-            if photo.orientation:
-                ml_params["orientation"] = photo.orientation
-
-            resp = http.post(
-                f"{settings.ml_service_url}/classify",
-                content=image_data,
-                headers={"Content-Type": photo.content_type},
-                params=ml_params or None,
-            )
-            candidates = resp.json().get("candidates", [])
-
-        photo.top5_candidates = candidates
-        photo.processing_status = ProcessingStatus.ready_for_validation
-        db.commit()
+                    classify.cancel()
+                    shark_bbox, zone_bbox = detected["shark_bbox"], detected["zone_bbox"]
+                    await run_in_threadpool(
+                        _update_photo, photo_id,
+                        shark_bbox=shark_bbox, zone_bbox=zone_bbox, auto_detected=True,
+                    )
+                    classify = asyncio.ensure_future(ml_batch.classify(
+                        image, job.content_type,
+                        _classify_params(shark_bbox, zone_bbox, job.orientation),
+                    ))
+            candidates = await classify
+        finally:
+            classify.cancel()  # no-op once done; stops a pending one on error
+
+        await run_in_threadpool(
+            _update_photo, photo_id,
+            top5_candidates=candidates,
+            processing_status=ProcessingStatus.ready_for_validation,
+        )
 
     except Exception:
         logger.exception("Error classifying photo %s", photo_id)
-        db.rollback()
         try:
-            photo = db.get(Photo, photo_id)
-            if photo:
-                photo.processing_status = ProcessingStatus.error
-                photo.top5_candidates = []
-                db.commit()
+            await run_in_threadpool(
+                _update_photo, photo_id,
+                processing_status=ProcessingStatus.error,
+                top5_candidates=[],
+            )
         except Exception:
             logger.exception("Failed to set error status for photo %s", photo_id)
-    finally:
-        db.close()
 
 
 # ── upload ────────────────────────────────────────────────────────────────────
@@ -137,7 +246,7 @@ async def upload_photo(
     current_user: User = Depends(require_editor),
 ):
     # Validate session exists
-    if not db.get(DiveSession, session_id):
+    if not row_exists(db, DiveSession, session_id):
         raise HTTPException(status_code=404, detail="Dive session not found")
 
     # Validate content type
@@ -147,41 +256,38 @@ async def upload_photo(
             detail="Only JPEG and PNG images are accepted",
         )
 
-    data = await file.read()
-
-    # H1: enforce file size limit
-    if len(data) > MAX_PHOTO_BYTES:
+    # H1: enforce file size limit (reading stops one chunk past it)
+    data = await read_limited(file, MAX_PHOTO_BYTES)
+    if data is None:
         raise HTTPException(
             status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
             detail=f"Photo exceeds the {MAX_PHOTO_BYTES // 1024 // 1024} MB limit.",
         )
 
-    # H1: verify file is actually a valid image
-    try:
-        img = Image.open(io.BytesIO(data))
-        img.verify()
-    except Exception:
+    # H1: verify file is actually a valid image, then extract EXIF — off the
+    # event loop, which this async handler would otherwise block
+    exif = await run_in_threadpool(_inspect_image, data, file.content_type)
+    if exif is None:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail="File is not a valid image",
         )
-
-    # Extract EXIF
-    exif = extract_exif(data)
     taken_at = parse_taken_at(exif)
     gps_lat, gps_lon = parse_gps(exif)
 
-    # Build MinIO object key
+    # Store in MinIO before the row exists, so a committed photo always has
+    # its object and the returned URL resolves
     photo_id = uuid.uuid4()
-    ext = "jpg" if file.content_type == "image/jpeg" else "png"
-    object_key = f"photos/{session_id}/{photo_id}.{ext}"
-    upload_file(data, object_key, file.content_type)
+    object_key = f"photos/{session_id}/{photo_id}.{PHOTO_EXTENSIONS[file.content_type]}"
+    await run_in_threadpool(upload_file, data, object_key, file.content_type)
 
     photo = Photo(
         id=photo_id,
         object_key=object_key,
         content_type=file.content_type,
         size=len(data),
+        # Set client-side so the response needs no reload after commit
+        uploaded_at=datetime.now(timezone.utc),
         exif_payload=exif,
         taken_at=taken_at,
         gps_lat=gps_lat,
@@ -197,12 +303,13 @@ async def upload_photo(
         detail={"filename": file.filename, "size": photo.size},
         request=request,
     )
+    out = enrich_photo(photo)
     db.commit()
-    db.refresh(photo)
 
-    background_tasks.add_task(_classify_photo, photo.id)
+    # Classify the bytes already in memory rather than downloading them back
+    background_tasks.add_task(_classify_photo, photo_id, data)
 
-    return enrich_photo(photo)
+    return out
 
 
 # ── validation queue — must be registered BEFORE /{photo_id} ─────────────────
@@ -233,9 +340,8 @@ def ml_stats(
     # Proxy ML service stats (non-fatal if unavailable)
     ml: dict = {}
     try:
-        with httpx.Client(timeout=5.0) as http:
-            resp = http.get(f"{settings.ml_service_url}/stats")
-            ml = resp.json()
+        resp = _ml_http().get(f"{settings.ml_service_url}/stats", timeout=5.0)
+        ml = resp.json()
     except Exception:
         pass
 
@@ -257,6 +363,7 @@ def unlinked_photos(
     """Photos that were explicitly left unlinked (validated, no shark)."""
     photos = (
         db.query(Photo)
+        .options(defer(Photo.exif_payload))  # not part of PhotoOut
         .filter(
             Photo.processing_status == ProcessingStatus.validated,
             Photo.shark_id.is_(None),
@@ -264,19 +371,25 @@ def unlinked_photos(
         .order_by(Photo.uploaded_at)
         .all()
     )
-    return [enrich_photo(p) for p in photos]
+    return enrich_photos(photos)
 
 
-@router.get("/photos/validation-queue/count")
+@router.get("/photos/validation-queue/count", response_model=QueueCount)
 def validation_queue_count(
     db: Session = Depends(get_db),
     _: User = Depends(require_editor),
 ):
-    count = (
-        db.query(Photo)
-        .filter(Photo.processing_status == ProcessingStatus.ready_for_validation)
-        .count()
-    )
+    # The UI polls this for a badge; a couple of seconds of staleness is fine
+    with _queue_count_lock:
+        count = _queue_count_cache.get("count")
+    if count is None:
+        count = db.scalar(
+            select(func.count())
+            .select_from(Photo)
+            .where(Photo.processing_status == ProcessingStatus.ready_for_validation)
+        )
+        with _queue_count_lock:
+            _queue_count_cache["count"] = count
     return {"count": count}
 
 
@@ -287,11 +400,12 @@ def validation_queue(
 ):
     photos = (
         db.query(Photo)
+        .options(defer(Photo.exif_payload))  # not part of PhotoOut
         .filter(Photo.processing_status == ProcessingStatus.ready_for_validation)
         .order_by(Photo.uploaded_at)
         .all()
     )
-    return [enrich_photo(p) for p in photos]
+    return enrich_photos(photos)
 
 
 # ── photo detail ──────────────────────────────────────────────────────────────
@@ -307,42 +421,38 @@ def get_photo(
 
 # ── background embedding task ────────────────────────────────────────────────
 
-def _store_embedding_for_shark(photo_id: UUID, shark_id: str, display_name: str) -> None:
+async def _store_embedding_for_shark(photo_id: UUID, shark_id: str, display_name: str) -> None:
     """Fetch image from MinIO and push its embedding to the ML service."""
-    db = SessionLocal()
     try:
-        photo = db.get(Photo, photo_id)
-        if not photo:
+        job = await run_in_threadpool(_load_ml_job, photo_id)
+        if job is None:
             return
-        image_data = get_object_bytes(photo.object_key)
 
         ml_params: dict = {
             "shark_id": shark_id,
             "display_name": display_name,
             "photo_id": str(photo_id),
         }
-        if photo.shark_bbox and photo.zone_bbox:
-            sb, zb = photo.shark_bbox, photo.zone_bbox
+        if job.shark_bbox and job.zone_bbox:
+            sb, zb = job.shark_bbox, job.zone_bbox
             ml_params.update({
                 "shark_x": sb["x"], "shark_y": sb["y"],
                 "shark_w": sb["w"], "shark_h": sb["h"],
                 "zone_x":  zb["x"], "zone_y":  zb["y"],
                 "zone_w":  zb["w"], "zone_h":  zb["h"],
             })
-        if photo.orientation:
-            ml_params["orientation"] = photo.orientation
+        if job.orientation:
+            ml_params["orientation"] = job.orientation
 
-        with httpx.Client(timeout=30.0) as http:
-            http.post(
+        async with httpx.AsyncClient(timeout=30.0) as http:
+            await http.post(
                 f"{settings.ml_service_url}/embeddings",
-                content=image_data,
-                headers={"Content-Type": photo.content_type},
+                content=iterate_in_threadpool(iter_object(job.object_key)),
+                headers={"Content-Type": job.content_type},
                 params=ml_params,
             )
     except Exception:
         logger.exception("Failed to store embedding for photo %s / shark %s", photo_id, shark_id)
-    finally:
-        db.close()
 
 
 # ── annotate ──────────────────────────────────────────────────────────────────
@@ -367,11 +477,11 @@ async def annotate_photo(
     photo.processing_status = ProcessingStatus.processing
     photo.top5_candidates = None
     log_event(db, current_user, A.PHOTO_ANNOTATE, resource_type="photo", resource_id=photo_id, request=request)
+    out = enrich_photo(photo)
     db.commit()
-    db.refresh(photo)
 
-    background_tasks.add_task(_classify_photo, photo.id)
-    return enrich_photo(photo)
+    background_tasks.add_task(_classify_photo, photo_id)
+    return out
 
 
 # ── recheck ───────────────────────────────────────────────────────────────────
@@ -408,11 +518,11 @@ def recheck_photo(
         db, current_user, A.PHOTO_RECHECK,
         resource_type="photo", resource_id=photo_id, request=request,
     )
+    out = enrich_photo(photo)
     db.commit()
-    db.refresh(photo)
 
-    background_tasks.add_task(_classify_photo, photo.id)
-    return enrich_photo(photo)
+    background_tasks.add_task(_classify_photo, photo_id)
+    return out
 
 
 # ── model status / add / remove ───────────────────────────────────────────────
@@ -426,12 +536,12 @@ def photo_model_status(
     """Check whether this photo's embedding is currently in the ML model."""
     _get_photo_or_404(db, photo_id)
     try:
-        with httpx.Client(timeout=10.0) as http:
-            resp = http.get(
-                f"{settings.ml_service_url}/embeddings/status",
-                params={"photo_id": str(photo_id)},
-            )
-            return resp.json()
+        resp = _ml_http().get(
+            f"{settings.ml_service_url}/embeddings/status",
+            params={"photo_id": str(photo_id)},
+            timeout=10.0,
+        )
+        return resp.json()
     except Exception:
         return {"photo_id": str(photo_id), "in_model": False}
 
@@ -457,7 +567,6 @@ def add_photo_to_model(
     if not shark:
         raise HTTPException(status_code=404, detail="Shark not found")
 
-    image_data = get_object_bytes(photo.object_key)
     ml_params: dict = {
         "shark_id": str(photo.shark_id),
         "display_name": shark.display_name,
@@ -481,21 +590,26 @@ def add_photo_to_model(
         ml_params["orientation"] = photo.orientation
 
     try:
-        with httpx.Client(timeout=30.0) as http:
-            resp = http.post(
-                f"{settings.ml_service_url}/embeddings",
-                content=image_data,
-                headers={"Content-Type": photo.content_type},
-                params=ml_params,
-            )
-            log_event(
-                db, current_user, "photo.add_to_model",
-                resource_type="photo", resource_id=photo_id, request=request,
-            )
-            db.commit()
-            return resp.json()
+        resp = _ml_http().post(
+            f"{settings.ml_service_url}/embeddings",
+            content=iter_object(photo.object_key),
+            headers={"Content-Type": photo.content_type},
+            params=ml_params,
+            timeout=30.0,
+        )
+        log_event(
+            db, current_user, "photo.add_to_model",
+            resource_type="photo", resource_id=photo_id, request=request,
+        )
+        db.commit()
+        return resp.json()
+    except (BotoCoreError, ClientError) as exc:
+        # The object is read lazily while the request body is sent
+        logger.exception("Could not read photo %s from storage", photo_id)
+        raise HTTPException(status_code=502, detail="Photo storage error") from exc
     except Exception as exc:
-        raise HTTPException(status_code=502, detail=f"ML service error: {exc}") from exc
+        logger.exception("Could not add photo %s to the model", photo_id)
+        raise HTTPException(status_code=502, detail="ML service error") from exc
 
 
 @router.delete("/photos/{photo_id}/from-model", status_code=status.HTTP_200_OK)
@@ -508,19 +622,20 @@ def remove_photo_from_model(
     """Remove this photo's embedding from the ML model."""
     _get_photo_or_404(db, photo_id)
     try:
-        with httpx.Client(timeout=10.0) as http:
-            resp = http.delete(
-                f"{settings.ml_service_url}/embeddings",
-                params={"photo_id": str(photo_id)},
-            )
-            log_event(
-                db, current_user, "photo.remove_from_model",
-                resource_type="photo", resource_id=photo_id, request=request,
-            )
-            db.commit()
-            return resp.json()
+        resp = _ml_http().delete(
+            f"{settings.ml_service_url}/embeddings",
+            params={"photo_id": str(photo_id)},
+            timeout=10.0,
+        )
+        log_event(
+            db, current_user, "photo.remove_from_model",
+            resource_type="photo", resource_id=photo_id, request=request,
+        )
+        db.commit()
+        return resp.json()
     except Exception as exc:
-        raise HTTPException(status_code=502, detail=f"ML service error: {exc}") from exc
+        logger.exception("Could not remove photo %s from the model", photo_id)
+        raise HTTPException(status_code=502, detail="ML service error") from exc
 
 
 # ── rebuild embeddings ────────────────────────────────────────────────────────
@@ -546,7 +661,6 @@ def _rebuild_embeddings_task() -> None:
                     shark = db.get(Shark, photo.shark_id)
                     if not shark:
                         continue
-                    image_data = get_object_bytes(photo.object_key)
                     ml_params: dict = {
                         "shark_id": str(photo.shark_id),
                         "display_name": shark.display_name,
@@ -564,7 +678,7 @@ def _rebuild_embeddings_task() -> None:
                         ml_params["orientation"] = photo.orientation
                     http.post(
                         f"{settings.ml_service_url}/embeddings",
-                        content=image_data,
+                        content=iter_object(photo.object_key),
                         headers={"Content-Type": photo.content_type},
                         params=ml_params,
                     )
@@ -651,7 +765,10 @@ def validate_photo(
             name_status=NameStatus(body.name_status),
         )
         db.add(shark)
-        db.flush()  # get shark.id before commit
+        # Not just for shark.id: the models declare no Photo/Observation -> Shark
+        # relationships, so this flush is what puts the sharks INSERT ahead of
+        # the rows that reference it. It is the same statement commit would send.
+        db.flush()
         photo.shark_id = shark.id
 
     elif body.action == "unlink":
@@ -679,8 +796,11 @@ def validate_photo(
             shark_id=photo.shark_id,
             photo_id=photo.id,
             taken_at=photo.taken_at,
+            # Scalar subquery inlined into the INSERT: no separate DiveSession round-trip
             location_id=(
-                db.get(DiveSession, photo.dive_session_id).location_id
+                select(DiveSession.location_id)
+                .where(DiveSession.id == photo.dive_session_id)
+                .scalar_subquery()
                 if photo.dive_session_id
                 else None
             ),
@@ -693,6 +813,7 @@ def validate_photo(
         detail={"action": body.action, "shark_id": str(body.shark_id) if body.shark_id else None},
         request=request,
     )
+    # Serialize before commit: every field is already in memory
+    out = enrich_photo(photo)
     db.commit()
-    db.refresh(photo)
-    return enrich_photo(photo)
+    return out
@@ -1,8 +1,10 @@
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from pydantic import TypeAdapter
+from sqlalchemy import func, null, select
+from sqlalchemy.orm import Session, defer
 
 from app.auth.dependencies import get_current_user, require_editor
 from app.database import get_db
@@ -12,13 +14,20 @@ from app.models.photo import Photo
 from app.models.shark import Shark
 from app.models.user import User
 from app.schemas.observation import ObservationOut
-from app.schemas.shark import SharkCreate, SharkDetail, SharkOut, SharkUpdate
+from app.schemas.shark import NameSuggestion, SharkCreate, SharkDetail, SharkOut, SharkUpdate
 from app.utils.audit import log_event
 from app.utils.names import suggest_name
-from app.utils.photo import enrich_photo, photo_url
+from app.utils.photo import enrich_photos, object_urls, photo_url
 
 router = APIRouter(prefix="/sharks", tags=["sharks"])
 
+# SharkOut fields read straight off the ORM row
+_SHARK_OUT_FIELDS = tuple(name for name in SharkOut.model_fields if name != "main_photo_url")
+
+_sharks_adapter = TypeAdapter(List[SharkOut])
+
+_MAX_OBSERVATIONS = 500
+
 
 def _get_or_404(db: Session, shark_id: UUID) -> Shark:
     s = db.get(Shark, shark_id)
@@ -27,7 +36,7 @@ def _get_or_404(db: Session, shark_id: UUID) -> Shark:
     return s
 
 
-@router.get("/suggest-name")
+@router.get("/suggest-name", response_model=NameSuggestion)
 def suggest_shark_name(
     db: Session = Depends(get_db),
     _: User = Depends(get_current_user),
@@ -38,27 +47,34 @@ def suggest_shark_name(
 @router.get("", response_model=List[SharkOut])
 def list_sharks(
     q: str = None,
+    expand_main_photo: bool = Query(
+        True,
+        description="Resolve main_photo_url. Pass false when only names/ids are "
+        "needed to skip the photo join and URL signing.",
+    ),
     db: Session = Depends(get_db),
     _: User = Depends(get_current_user),
 ):
-    sharks = db.query(Shark)
+    # One round-trip: each shark with its main photo's object key (if any)
+    if expand_main_photo:
+        rows = db.query(Shark, Photo.object_key).outerjoin(Photo, Photo.id == Shark.main_photo_id)
+    else:
+        rows = db.query(Shark, null())
     if q:
-        sharks = sharks.filter(Shark.display_name.ilike(f"%{q}%"))
-    sharks = sharks.order_by(Shark.display_name).all()
-
-    main_photo_ids = [s.main_photo_id for s in sharks if s.main_photo_id]
-    photos_by_id = {}
-    if main_photo_ids:
-        photos = db.query(Photo).filter(Photo.id.in_(main_photo_ids)).all()
-        photos_by_id = {p.id: p for p in photos}
-
-    result = []
-    for s in sharks:
-        out = SharkOut.model_validate(s)
-        if s.main_photo_id and s.main_photo_id in photos_by_id:
-            out.main_photo_url = photo_url(photos_by_id[s.main_photo_id])
-        result.append(out)
-    return result
+        rows = rows.filter(Shark.display_name.ilike(f"%{q}%"))
+    rows = rows.order_by(Shark.display_name).all()
+    urls = object_urls(key for _, key in rows if key)
+
+    # Trusted ORM rows: construct without re-validating every field
+    results = [
+        SharkOut.model_construct(
+            **{name: getattr(s, name) for name in _SHARK_OUT_FIELDS},
+            main_photo_url=urls.get(key) if key else None,
+        )
+        for s, key in rows
+    ]
+    # Serialise once; returning a Response skips FastAPI's re-validation pass
+    return Response(content=_sharks_adapter.dump_json(results), media_type="application/json")
 
 
 @router.post("", response_model=SharkOut, status_code=status.HTTP_201_CREATED)
@@ -85,40 +101,65 @@ def create_shark(
 @router.get("/{shark_id}", response_model=SharkDetail)
 def get_shark(
     shark_id: UUID,
+    observations_limit: Optional[int] = Query(None, ge=1, le=_MAX_OBSERVATIONS),
     db: Session = Depends(get_db),
     _: User = Depends(get_current_user),
 ):
-    shark = _get_or_404(db, shark_id)
-    all_photos = (
-        db.query(Photo)
-        .filter(Photo.shark_id == shark_id)
+    """Without observations_limit every observation is returned; with one,
+    only the most recent are, while the sighting stats still cover all."""
+    # Shark and its photos in one round-trip (shark row repeated per photo)
+    rows = (
+        db.query(Shark, Photo)
+        .outerjoin(Photo, Photo.shark_id == Shark.id)
+        .options(defer(Photo.exif_payload))
+        .filter(Shark.id == shark_id)
         .order_by(Photo.uploaded_at)
         .all()
     )
-    profile_photos = [p for p in all_photos if p.is_profile_photo]
+    if not rows:
+        raise HTTPException(status_code=404, detail="Shark not found")
+    shark = rows[0][0]
+    all_photos = [p for _, p in rows if p is not None]
     observations = (
         db.query(Observation)
         .filter(Observation.shark_id == shark_id)
         .order_by(Observation.taken_at.desc().nullslast())
-        .all()
     )
-
-    # Req11: compute first/last seen from observation taken_at
-    obs_dates = [o.taken_at for o in observations if o.taken_at is not None]
-    first_seen = min(obs_dates) if obs_dates else None
-    last_seen = max(obs_dates) if obs_dates else None
+    if observations_limit is not None:
+        observations = observations.limit(observations_limit)
+    observations = observations.all()
+
+    # Req11: first/last seen from observation taken_at
+    if observations_limit is None:
+        # Full list, newest-first with NULLs last: both ends are read off it
+        last_seen = observations[0].taken_at if observations else None
+        first_seen = next(
+            (o.taken_at for o in reversed(observations) if o.taken_at is not None), None
+        )
+        sighting_count = len(observations)
+    else:
+        # Truncated list: aggregate in SQL over the (shark_id, taken_at) index
+        first_seen, last_seen, sighting_count = db.execute(
+            select(
+                func.min(Observation.taken_at),
+                func.max(Observation.taken_at),
+                func.count(),
+            ).where(Observation.shark_id == shark_id)
+        ).one()
 
     detail = SharkDetail.model_validate(shark)
-    detail.all_photos = [enrich_photo(p) for p in all_photos]
-    detail.profile_photos = [enrich_photo(p) for p in profile_photos]
+    # One validation + URL pass; the profile list reuses the same outputs
+    enriched = enrich_photos(all_photos)
+    detail.all_photos = enriched
+    detail.profile_photos = [out for p, out in zip(all_photos, enriched) if p.is_profile_photo]
     detail.observations = [ObservationOut.model_validate(o) for o in observations]
-    detail.sighting_count = len(observations)
+    detail.sighting_count = sighting_count
     detail.first_seen = first_seen
     detail.last_seen = last_seen
     if shark.main_photo_id:
-        main = next((p for p in all_photos if p.id == shark.main_photo_id), None)
+        main = {out.id: out for out in enriched}.get(shark.main_photo_id)
         if main:
-            detail.main_photo_url = photo_url(main)
+            detail.main_photo_url = main.url
     return detail
 
 
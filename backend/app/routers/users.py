@@ -1,11 +1,15 @@
 from typing import List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from pydantic import TypeAdapter
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.auth.dependencies import get_current_user, require_admin
 from app.auth.hashing import hash_password
+from app.auth.session_cache import invalidate_user
 from app.database import get_db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserOut, UserUpdate
@@ -14,6 +18,11 @@ router = APIRouter(prefix="/users", tags=["users"])
 
 VALID_ROLES = {'admin', 'editor', 'viewer'}
 
+_users_adapter = TypeAdapter(List[UserOut])
+
+# Exactly the columns UserOut exposes (password_hash stays in the database)
+_USER_OUT_COLUMNS = tuple(getattr(User, name) for name in UserOut.model_fields)
+
 
 def _get_or_404(db: Session, user_id: UUID) -> User:
     user = db.get(User, user_id)
@@ -32,7 +41,10 @@ def list_users(
     db: Session = Depends(get_db),
     _: User = Depends(require_admin),
 ):
-    return db.query(User).order_by(User.created_at).all()
+    rows = db.execute(select(*_USER_OUT_COLUMNS).order_by(User.created_at))
+    # Trusted column values: construct without re-validating every field
+    users = [UserOut.model_construct(**row._mapping) for row in rows]
+    return Response(content=_users_adapter.dump_json(users), media_type="application/json")
 
 
 @router.post("", response_model=UserOut, status_code=status.HTTP_201_CREATED)
@@ -43,13 +55,20 @@ def create_user(
 ):
     if body.role not in VALID_ROLES:
         raise HTTPException(status_code=422, detail=f"role must be one of {sorted(VALID_ROLES)}")
-    if db.query(User).filter(User.email == body.email).first():
+    # Uniqueness is enforced by the email index: one INSERT ... RETURNING, no pre-SELECT race
+    stmt = (
+        insert(User)
+        .values(email=body.email, password_hash=hash_password(body.password), role=body.role)
+        .returning(User)
+    )
+    try:
+        user = db.scalars(stmt).one()
+        out = UserOut.model_validate(user)
+        db.commit()
+    except IntegrityError:
+        db.rollback()
         raise HTTPException(status_code=409, detail="Email already registered")
-    user = User(email=body.email, password_hash=hash_password(body.password), role=body.role)
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    return user
+    return out
 
 
 @router.put("/{user_id}", response_model=UserOut)
@@ -60,10 +79,8 @@ def update_user(
     _: User = Depends(require_admin),
 ):
     user = _get_or_404(db, user_id)
+    old_email = user.email
     if body.email is not None:
-        existing = db.query(User).filter(User.email == body.email, User.id != user_id).first()
-        if existing:
-            raise HTTPException(status_code=409, detail="Email already registered")
         user.email = body.email
     if body.password is not None:
         user.password_hash = hash_password(body.password)
@@ -71,9 +88,16 @@ def update_user(
         if body.role not in VALID_ROLES:
             raise HTTPException(status_code=422, detail=f"role must be one of {sorted(VALID_ROLES)}")
         user.role = body.role
-    db.commit()
-    db.refresh(user)
-    return user
+    # Same as create_user: the email index reports conflicts, no pre-SELECT.
+    # Serialize before commit so expiry doesn't force a reload of the row.
+    out = UserOut.model_validate(user)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Email already registered")
+    invalidate_user(old_email)
+    return out
 
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -85,5 +109,7 @@ def delete_user(
     if current_user.id == user_id:
         raise HTTPException(status_code=409, detail="Cannot delete your own account")
     user = _get_or_404(db, user_id)
+    email = user.email
     db.delete(user)
     db.commit()
+    invalidate_user(email)
@@ -1,103 +1,159 @@
-import base64
+import asyncio
 import logging
 import uuid
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from typing import List
 from uuid import UUID
 
 import httpx
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, UploadFile, status
+import pybase64
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response, UploadFile, status
+from pydantic import TypeAdapter
+from sqlalchemy import delete, insert, or_, select, update
 from sqlalchemy.orm import Session
 
 from app.auth.dependencies import get_current_user, require_editor
 from app.config import settings
-from app.database import SessionLocal, get_db
+from app.database import SessionLocal, get_db, row_exists
 from app.models.audit_log import A
 from app.models.dive_session import DiveSession
 from app.models.photo import Photo, ProcessingStatus
 from app.models.user import User
 from app.models.video import Video, VideoStatus
 from app.schemas.video import VideoOut
-from app.storage.minio import delete_file, get_object_bytes, upload_file
+from app.storage.minio import delete_file, iter_object, upload_file, upload_fileobj
+from app.utils import ml_batch
 from app.utils.audit import log_event
+from app.utils.upload import LimitedReader, UploadTooLarge
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["videos"])
 
-ALLOWED_VIDEO_TYPES = {
-    "video/mp4",
-    "video/quicktime",
-    "video/avi",
-    "video/x-msvideo",
-    "video/x-matroska",
-    "video/webm",
+_videos_adapter = TypeAdapter(List[VideoOut])
+_VIDEO_OUT_COLUMNS = tuple(getattr(Video, name) for name in VideoOut.model_fields)
+
+# Accepted content types and the object-key extension stored for each
+VIDEO_EXTENSIONS = {
+    "video/mp4": "mp4",
+    "video/quicktime": "mov",
+    "video/avi": "avi",
+    "video/x-msvideo": "avi",
+    "video/x-matroska": "mkv",
+    "video/webm": "webm",
 }
+ALLOWED_VIDEO_TYPES = frozenset(VIDEO_EXTENSIONS)
 
 # 500 MB hard limit
 MAX_VIDEO_BYTES = 500 * 1024 * 1024
+TOO_LARGE_DETAIL = f"Video exceeds the {MAX_VIDEO_BYTES // 1024 // 1024} MB limit."
+# upload_video's route, for the ContentLengthLimit middleware (app.main)
+UPLOAD_PATH_PATTERN = r"/dive-sessions/[^/]+/videos"
+
+# Frames classified in parallel per video
+_FRAME_CONCURRENCY = 4
+# Frame uploads to MinIO in parallel per video
+_UPLOAD_CONCURRENCY = 8
+
+
+def _too_large() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=TOO_LARGE_DETAIL)
 
 
 # ── background task ───────────────────────────────────────────────────────────
 
-def _process_video(video_id: UUID) -> None:
-    """Download video from MinIO, call ML /process-video, create Photo records."""
+async def _classify_frames(photo_ids: list[UUID]) -> None:
+    """Classify extracted frames, at most _FRAME_CONCURRENCY at a time."""
     from app.routers.photos import _classify_photo
 
-    db = SessionLocal()
+    sem = asyncio.Semaphore(_FRAME_CONCURRENCY)
+
+    async def _one(pid: UUID) -> None:
+        async with sem:
+            await _classify_photo(pid)
+
     try:
-        video = db.get(Video, video_id)
-        if not video:
-            return
+        results = await asyncio.gather(*(_one(pid) for pid in photo_ids), return_exceptions=True)
+    finally:
+        # This loop ends with the call; release its batcher (and the loop with it)
+        await ml_batch.close()
+    for pid, result in zip(photo_ids, results):
+        if isinstance(result, Exception):
+            logger.error("Frame classification failed for photo %s", pid, exc_info=result)
+
+
+def _extract_frames(object_key: str, content_type: str) -> list:
+    """Stream the video from MinIO to ML /process-video and return its frames.
+
+    The video goes up in chunks, never fully in memory. The raw response
+    body is released when this returns, so it is not held alongside the
+    decoded frames.
+    """
+    with httpx.Client(timeout=300.0) as http:
+        resp = http.post(
+            f"{settings.ml_service_url}/process-video",
+            content=iter_object(object_key),
+            headers={"Content-Type": content_type},
+        )
+        resp.raise_for_status()
+        return resp.json().get("frames", [])
 
-        video.processing_status = VideoStatus.processing
-        db.commit()
 
-        video_data = get_object_bytes(video.object_key)
+def _process_video(video_id: UUID) -> None:
+    """Download video from MinIO, call ML /process-video, create Photo records."""
+    db = SessionLocal()
+    try:
+        # Claim the job atomically: only one worker moves it out of 'uploaded',
+        # so a resumed job and its original task never both run
+        claimed = db.execute(
+            update(Video)
+            .where(Video.id == video_id, Video.processing_status == VideoStatus.uploaded)
+            .values(processing_status=VideoStatus.processing, claimed_at=datetime.now(timezone.utc))
+        ).rowcount
+        db.commit()
+        if not claimed:
+            return
+        video = db.get(Video, video_id)
 
-        with httpx.Client(timeout=300.0) as http:
-            resp = http.post(
-                f"{settings.ml_service_url}/process-video",
-                content=video_data,
-                headers={"Content-Type": video.content_type},
-            )
-            resp.raise_for_status()
-            frames = resp.json().get("frames", [])
+        frames = _extract_frames(video.object_key, video.content_type)
 
-        # Create Photo records and upload frames
-        photo_ids: list[UUID] = []
+        # Upload all frames to MinIO in parallel, then insert the Photo rows
+        # with one executemany INSERT and one commit (ids are client-side, so
+        # nothing needs reading back)
+        rows: list[dict] = []
+        uploads: list[tuple[bytes, str]] = []
         for frame in frames:
-            jpeg_bytes = base64.b64decode(frame["jpeg"])
+            jpeg_bytes = pybase64.b64decode(frame["jpeg"])  # SIMD decoder, same output
             photo_id = uuid.uuid4()
             object_key = f"photos/{video.dive_session_id}/{photo_id}.jpg"
+            uploads.append((jpeg_bytes, object_key))
+            rows.append({
+                "id": photo_id,
+                "object_key": object_key,
+                "content_type": "image/jpeg",
+                "size": len(jpeg_bytes),
+                "dive_session_id": video.dive_session_id,
+                "shark_bbox": frame["shark_bbox"],
+                "zone_bbox": frame["zone_bbox"],
+                "auto_detected": True,
+                "processing_status": ProcessingStatus.processing,
+            })
+        del frames
+
+        with ThreadPoolExecutor(max_workers=_UPLOAD_CONCURRENCY) as pool:
+            # list() re-raises the first failed upload
+            list(pool.map(lambda u: upload_file(u[0], u[1], "image/jpeg"), uploads))
+        del uploads
+
+        if rows:
+            db.execute(insert(Photo), rows)
+        db.commit()
+        photo_ids = [row["id"] for row in rows]
 
-            upload_file(jpeg_bytes, object_key, "image/jpeg")
-
-            photo = Photo(
-                id=photo_id,
-                object_key=object_key,
-                content_type="image/jpeg",
-                size=len(jpeg_bytes),
-                dive_session_id=video.dive_session_id,
-                shark_bbox=frame["shark_bbox"],
-                zone_bbox=frame["zone_bbox"],
-                auto_detected=True,
-                processing_status=ProcessingStatus.processing,
-            )
-            db.add(photo)
-            db.commit()
-            db.refresh(photo)
-            photo_ids.append(photo.id)
-
-        # L3: Classify frames in parallel
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            futures = {executor.submit(_classify_photo, pid): pid for pid in photo_ids}
-            for future in as_completed(futures):
-                pid = futures[future]
-                try:
-                    future.result()
-                except Exception:
-                    logger.exception("Frame classification failed for photo %s", pid)
+        # L3: Classify frames concurrently (this task runs in a worker thread,
+        # so it drives its own event loop for the async ML calls)
+        asyncio.run(_classify_frames(photo_ids))
 
         video.frames_extracted = len(photo_ids)
         video.processing_status = VideoStatus.done
@@ -117,6 +173,47 @@ def _process_video(video_id: UUID) -> None:
         db.close()
 
 
+def resume_pending_videos() -> None:
+    """Recover video jobs whose worker went away. Must run in a single process.
+
+    A 'processing' claim older than video_job_timeout belongs to a worker that
+    died mid-job (e.g. a deploy during the ML call); some of its frames may
+    already be stored, so it is marked 'error' rather than re-run. An
+    'uploaded' video older than video_pickup_grace lost its background task
+    and is processed here, through the same atomic claim as that task.
+    """
+    now = datetime.now(timezone.utc)
+    db = SessionLocal()
+    try:
+        interrupted = db.execute(
+            update(Video)
+            .where(
+                Video.processing_status == VideoStatus.processing,
+                or_(
+                    Video.claimed_at.is_(None),
+                    Video.claimed_at < now - timedelta(seconds=settings.video_job_timeout),
+                ),
+            )
+            .values(processing_status=VideoStatus.error)
+        ).rowcount
+        db.commit()
+        if interrupted:
+            logger.warning("Marked %d interrupted video job(s) as error", interrupted)
+        pending = db.scalars(
+            select(Video.id).where(
+                Video.processing_status == VideoStatus.uploaded,
+                Video.uploaded_at < now - timedelta(seconds=settings.video_pickup_grace),
+            )
+        ).all()
+    except Exception:
+        logger.exception("Could not look up pending videos")
+        return
+    finally:
+        db.close()
+    for video_id in pending:
+        _process_video(video_id)  # no-op if another worker claims it first
+
+
 # ── routes ────────────────────────────────────────────────────────────────────
 
 @router.post(
@@ -124,7 +221,7 @@ def _process_video(video_id: UUID) -> None:
     response_model=VideoOut,
     status_code=status.HTTP_201_CREATED,
 )
-async def upload_video(
+def upload_video(
     session_id: UUID,
     file: UploadFile,
     request: Request,
@@ -132,7 +229,9 @@ async def upload_video(
     db: Session = Depends(get_db),
     current_user: User = Depends(require_editor),
 ):
-    if not db.get(DiveSession, session_id):
+    """Plain def on purpose: FastAPI runs it in the threadpool, so the sync DB
+    session and the MinIO transfer never block the event loop."""
+    if not row_exists(db, DiveSession, session_id):
         raise HTTPException(status_code=404, detail="Dive session not found")
 
     if file.content_type not in ALLOWED_VIDEO_TYPES:
@@ -141,37 +240,28 @@ async def upload_video(
             detail="Unsupported format. Use MP4, MOV, AVI, MKV, or WebM.",
         )
 
-    # M3: Check Content-Length header before reading the full body
+    # ContentLengthLimit (app.main) normally refuses these before the body is
+    # received; kept so the limit holds if the route and its pattern drift.
     content_length = request.headers.get("content-length")
-    if content_length and int(content_length) > MAX_VIDEO_BYTES:
-        raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail=f"Video exceeds the {MAX_VIDEO_BYTES // 1024 // 1024} MB limit.",
-        )
+    if content_length and content_length.isdigit() and int(content_length) > MAX_VIDEO_BYTES:
+        raise _too_large()
 
-    data = await file.read()
-    if len(data) > MAX_VIDEO_BYTES:
-        raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail=f"Video exceeds the {MAX_VIDEO_BYTES // 1024 // 1024} MB limit.",
-        )
-
-    ext_map = {
-        "video/mp4": "mp4", "video/quicktime": "mov",
-        "video/avi": "avi", "video/x-msvideo": "avi",
-        "video/x-matroska": "mkv", "video/webm": "webm",
-    }
-    ext = ext_map.get(file.content_type, "mp4")
     video_id = uuid.uuid4()
-    object_key = f"videos/{session_id}/{video_id}.{ext}"
+    object_key = f"videos/{session_id}/{video_id}.{VIDEO_EXTENSIONS[file.content_type]}"
 
-    upload_file(data, object_key, file.content_type)
+    # Stream the spooled upload to MinIO in parts instead of reading it into
+    # memory; the reader enforces the size limit as it goes
+    reader = LimitedReader(file.file, MAX_VIDEO_BYTES)
+    try:
+        upload_fileobj(reader, object_key, file.content_type)
+    except UploadTooLarge:
+        raise _too_large()
 
     video = Video(
         id=video_id,
         object_key=object_key,
         content_type=file.content_type,
-        size=len(data),
+        size=reader.bytes_read,
         dive_session_id=session_id,
     )
     db.add(video)
@@ -201,15 +291,19 @@ def delete_video(
     db: Session = Depends(get_db),
     current_user: User = Depends(require_editor),
 ):
-    video = db.get(Video, video_id)
-    if not video or video.dive_session_id != session_id:
+    # Only the object key is needed: one DELETE ... RETURNING, scoped to the session
+    object_key = db.scalar(
+        delete(Video)
+        .where(Video.id == video_id, Video.dive_session_id == session_id)
+        .returning(Video.object_key)
+    )
+    if object_key is None:
         raise HTTPException(status_code=404, detail="Video not found")
     log_event(db, current_user, A.VIDEO_DELETE, resource_type="video", resource_id=video_id, request=request)
     try:
-        delete_file(video.object_key)
+        delete_file(object_key)
     except Exception:
         pass
-    db.delete(video)
     db.commit()
 
 
@@ -219,9 +313,11 @@ def list_videos(
     db: Session = Depends(get_db),
     _: User = Depends(get_current_user),
 ):
-    return (
-        db.query(Video)
-        .filter(Video.dive_session_id == session_id)
+    rows = db.execute(
+        select(*_VIDEO_OUT_COLUMNS)
+        .where(Video.dive_session_id == session_id)
         .order_by(Video.uploaded_at.desc())
-        .all()
     )
+    # Plain column rows: no ORM identity-map hydration, no re-validation
+    videos = [VideoOut.model_construct(**row._mapping) for row in rows]
+    return Response(content=_videos_adapter.dump_json(videos), media_type="application/json")
@@ -29,7 +29,7 @@ class DiveSessionOut(BaseModel):
     comment: Optional[str]
     created_at: datetime
 
-    # Aggregates populated by the list endpoint
+    # Aggregates populated by the list and detail endpoints
     shark_count: int = 0
     queue_count: int = 0
     shark_thumbs: List[str] = []
@@ -38,6 +38,10 @@ class PhotoOut(BaseModel):
     url: Optional[str] = None
 
 
+class QueueCount(BaseModel):
+    count: int
+
+
 class ValidateRequest(BaseModel):
     action: Literal["confirm", "select", "create", "unlink"]
     shark_id: Optional[UUID] = None    # required for "confirm" and "select"
@@ -18,6 +18,10 @@ class SharkUpdate(BaseModel):
     main_photo_id: Optional[UUID] = None
 
 
+class NameSuggestion(BaseModel):
+    name: str
+
+
 class SharkOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -1,13 +1,44 @@
+import io
 import threading
+from typing import BinaryIO, Dict, Iterable, Iterator
+from urllib.parse import quote
 
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.auth import S3SigV4QueryAuth
+from botocore.awsrequest import AWSRequest
 from botocore.client import Config
+from botocore.credentials import Credentials
+from cachetools import TTLCache
 
 from app.config import settings
 
+_REGION = "us-east-1"
+
 _client_instance = None
 _client_lock = threading.Lock()
 
+# Multipart above 16 MB, up to 8 parts in flight; single PUT below
+_MULTIPART_THRESHOLD = 16 * 1024 * 1024
+_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=_MULTIPART_THRESHOLD,
+    multipart_chunksize=16 * 1024 * 1024,
+    max_concurrency=8,
+    use_threads=True,
+)
+
+# Signed URLs are reused until 10 minutes before they expire, so a URL handed to
+# a client is always good for at least that long. Keyed by (object_key, expires).
+_URL_MIN_REMAINING = 600
+_url_cache: TTLCache = TTLCache(
+    maxsize=50_000,
+    ttl=max(
+        1,
+        min(settings.presigned_url_cache_ttl, settings.presigned_url_expiry - _URL_MIN_REMAINING),
+    ),
+)
+_url_cache_lock = threading.Lock()
+
 
 def _client():
     global _client_instance
@@ -19,30 +50,107 @@ def _client():
                     endpoint_url=f"http://{settings.minio_endpoint}",
                     aws_access_key_id=settings.minio_root_user,
                     aws_secret_access_key=settings.minio_root_password,
-                    config=Config(signature_version="s3v4"),
-                    region_name="us-east-1",
+                    config=Config(
+                        signature_version="s3v4",
+                        # Shared by request handlers and background tasks
+                        max_pool_connections=settings.minio_max_pool_connections,
+                        tcp_keepalive=True,
+                        retries={"max_attempts": 3, "mode": "standard"},
+                    ),
+                    region_name=_REGION,
                 )
     return _client_instance
 
 
 def upload_file(data: bytes, object_key: str, content_type: str) -> str:
     """Upload bytes to MinIO. Returns the object_key."""
-    _client().put_object(
-        Bucket=settings.minio_bucket,
-        Key=object_key,
-        Body=data,
-        ContentType=content_type,
+    if len(data) < _MULTIPART_THRESHOLD:
+        # Photos and frames: one PutObject, without spinning up transfer threads
+        _client().put_object(
+            Bucket=settings.minio_bucket, Key=object_key, Body=data, ContentType=content_type
+        )
+        return object_key
+    return upload_fileobj(io.BytesIO(data), object_key, content_type)  # BytesIO shares the buffer
+
+
+def upload_fileobj(fileobj: BinaryIO, object_key: str, content_type: str) -> str:
+    """Upload a readable file object to MinIO in parts, without loading it
+    into memory. Returns the object_key."""
+    _client().upload_fileobj(
+        fileobj,
+        settings.minio_bucket,
+        object_key,
+        ExtraArgs={"ContentType": content_type},
+        Config=_TRANSFER_CONFIG,
     )
     return object_key
 
 
-def get_presigned_url(object_key: str, expires: int = 3600) -> str:
-    """Return a time-limited presigned URL for the given object."""
-    return _client().generate_presigned_url(
+def _sign(object_key: str, expires: int) -> str:
+    url = _client().generate_presigned_url(
         "get_object",
         Params={"Bucket": settings.minio_bucket, "Key": object_key},
         ExpiresIn=expires,
     )
+    with _url_cache_lock:
+        _url_cache[(object_key, expires)] = url
+    return url
+
+
+def _sign_many(object_keys: Iterable[str], expires: int) -> Dict[str, str]:
+    """SigV4 query-sign many keys with one signer.
+
+    Produces the same path-style URLs as generate_presigned_url, without
+    going through the client's per-call parameter validation and event
+    hooks (about 4x cheaper per key).
+    """
+    signer = S3SigV4QueryAuth(
+        Credentials(settings.minio_root_user, settings.minio_root_password),
+        "s3", _REGION, expires=expires,
+    )
+    base = f"http://{settings.minio_endpoint}/{settings.minio_bucket}/"
+    urls = {}
+    for key in object_keys:
+        request = AWSRequest(method="GET", url=base + quote(key))
+        signer.add_auth(request)
+        urls[key] = request.prepare().url
+    return urls
+
+
+def get_presigned_url(object_key: str, expires: int = settings.presigned_url_expiry) -> str:
+    """Return a time-limited presigned URL for the given object."""
+    with _url_cache_lock:
+        url = _url_cache.get((object_key, expires))
+    return url if url is not None else _sign(object_key, expires)
+
+
+def get_presigned_urls(
+    object_keys: Iterable[str], expires: int = settings.presigned_url_expiry
+) -> Dict[str, str]:
+    """Presign many objects with one signer; returns {object_key: url}.
+
+    Duplicate and recently signed keys are not re-signed; the rest are
+    signed in one pass.
+    """
+    urls: Dict[str, str] = {}
+    missing = []
+    with _url_cache_lock:
+        for key in object_keys:
+            if key in urls:
+                continue
+            url = _url_cache.get((key, expires))
+            if url is None:
+                missing.append(key)
+                urls[key] = None
+            else:
+                urls[key] = url
+    if missing:
+        signed = _sign_many(missing, expires)
+        urls.update(signed)
+        with _url_cache_lock:
+            for key, url in signed.items():
+                _url_cache[(key, expires)] = url
+    return urls
 
 
 def get_object_bytes(object_key: str) -> bytes:
@@ -51,6 +159,21 @@ def get_object_bytes(object_key: str) -> bytes:
     return obj["Body"].read()
 
 
+def iter_object(object_key: str, chunk_size: int = 1024 * 1024) -> Iterator[bytes]:
+    """Stream an object from MinIO in chunks instead of reading it into memory.
+
+    The GET is issued lazily on first iteration; the body is closed when the
+    generator finishes or is closed.
+    """
+    body = _client().get_object(Bucket=settings.minio_bucket, Key=object_key)["Body"]
+    try:
+        yield from body.iter_chunks(chunk_size)
+    finally:
+        body.close()
+
+
 def delete_file(object_key: str) -> None:
     """Delete an object from MinIO."""
     _client().delete_object(Bucket=settings.minio_bucket, Key=object_key)
+    with _url_cache_lock:
+        _url_cache.pop((object_key, settings.presigned_url_expiry), None)
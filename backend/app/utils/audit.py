@@ -1,8 +1,18 @@
-from typing import Optional
+import logging
+from typing import Iterable, Optional
 from uuid import UUID
 
+from sqlalchemy import insert
+
+from app.database import SessionLocal
 from app.models.audit_log import AuditLog
 
+logger = logging.getLogger(__name__)
+
+
+def client_ip(request) -> Optional[str]:
+    return request.client.host if request and request.client else None
+
 
 def log_event(
     db,
@@ -15,10 +25,6 @@ def log_event(
 ) -> None:
     """Add an audit log entry. The caller owns the commit — the log rolls back
     with the main transaction on failure."""
-    ip = None
-    if request and request.client:
-        ip = request.client.host
-
     db.add(AuditLog(
         user_id=user.id,
         user_email=user.email,
@@ -26,5 +32,58 @@ def log_event(
         resource_type=resource_type,
         resource_id=resource_id,
         detail=detail,
-        ip_address=ip,
+        ip_address=client_ip(request),
     ))
+
+
+def log_events(db, user, events: Iterable[dict], request=None) -> None:
+    """Bulk form of log_event() for endpoints that touch many rows at once.
+
+    Each event is a dict of action plus optional resource_type / resource_id /
+    detail. All entries go out as one executemany INSERT instead of N ORM
+    objects; like log_event(), the caller owns the commit.
+    """
+    base = {
+        "user_id": user.id,
+        "user_email": user.email,
+        "resource_type": None,
+        "resource_id": None,
+        "detail": None,
+        "ip_address": client_ip(request),
+    }
+    rows = [{**base, **event} for event in events]
+    if rows:
+        db.execute(insert(AuditLog), rows)
+
+
+def write_event(
+    user_id: UUID,
+    user_email: str,
+    action: str,
+    resource_type: Optional[str] = None,
+    resource_id: Optional[UUID] = None,
+    detail: Optional[dict] = None,
+    ip_address: Optional[str] = None,
+) -> None:
+    """Insert an audit entry in its own session and commit it.
+
+    For BackgroundTasks on requests that have nothing else to commit, so the
+    response doesn't wait on the audit write. Takes plain values, not ORM
+    objects — the request session is closed by the time this runs.
+    """
+    db = SessionLocal()
+    try:
+        db.add(AuditLog(
+            user_id=user_id,
+            user_email=user_email,
+            action=action,
+            resource_type=resource_type,
+            resource_id=resource_id,
+            detail=detail,
+            ip_address=ip_address,
+        ))
+        db.commit()
+    except Exception:
+        logger.exception("Failed to write audit event %s for %s", action, user_email)
+    finally:
+        db.close()
@@ -19,7 +19,9 @@ def _serialize(value: Any) -> Any:
         return [_serialize(v) for v in value]
     if isinstance(value, dict):
         return {str(k): _serialize(v) for k, v in value.items()}
-    if isinstance(value, (int, float, str, bool, type(None))):
+    if isinstance(value, str):
+        return value.replace("\x00", "")  # NUL padding; jsonb rejects \u0000
+    if isinstance(value, (int, float, bool, type(None))):
         return value
     return str(value)
 
@@ -28,6 +30,14 @@ def extract_exif(data: bytes) -> Dict[str, Any]:
     """Return a JSON-safe dict of all EXIF tags from image bytes."""
     try:
         img = Image.open(io.BytesIO(data))
+    except (OSError, SyntaxError, ValueError):
+        return {}
+    return exif_from_image(img)
+
+
+def exif_from_image(img: Image.Image) -> Dict[str, Any]:
+    """Same as extract_exif, for an image that is already open (header parsed)."""
+    try:
         exif = img.getexif()
         if not exif:
             return {}
@@ -0,0 +1,160 @@
+"""
+Dynamic micro-batching of /classify calls to the ML service.
+
+Concurrent classifications are queued and sent together: the first queued
+photo waits up to `ml_batch_max_latency_ms` for others to join, up to
+`ml_batch_max_size` photos go out as one multipart POST to /classify-batch,
+and each caller's future is resolved with its own candidates. A lone photo
+still uses the plain /classify endpoint. Failures stay per photo: an image the
+service cannot decode fails only its own caller, and if the batch request
+itself fails, its photos are retried one by one through /classify.
+
+One batcher exists per event loop (the request loop, plus the short-lived
+loops video processing runs frame classification on). A short-lived loop must
+call close() before it finishes: the batcher's worker task references the
+loop, so the weak-keyed entry would otherwise never be dropped.
+"""
+import asyncio
+import json
+import logging
+import weakref
+from typing import List, NamedTuple, Optional
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class _Pending(NamedTuple):
+    image: bytes
+    content_type: str
+    params: dict
+    future: asyncio.Future
+
+
+class _Batcher:
+    def __init__(self, max_size: int, max_latency: float):
+        self._max_size = max_size
+        self._max_latency = max_latency
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._inflight: set = set()
+        self._worker = asyncio.get_running_loop().create_task(self._collect())
+
+    async def submit(self, image: bytes, content_type: str, params: dict) -> list:
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(_Pending(image, content_type, params, future))
+        return await future
+
+    async def aclose(self) -> None:
+        tasks = [self._worker, *self._inflight]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _collect(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self._max_latency
+            while len(batch) < self._max_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            # Dispatch without blocking collection of the next batch
+            task = loop.create_task(self._dispatch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, batch: List[_Pending]) -> None:
+        # Callers that gave up while queued (e.g. a speculative classify that
+        # /detect superseded) would only cost a wasted inference
+        batch = [item for item in batch if not item.future.cancelled()]
+        if not batch:
+            return
+        try:
+            async with httpx.AsyncClient(timeout=30.0) as http:
+                await self._send(http, batch)
+        except Exception as exc:
+            for item in batch:
+                _fail(item, exc)
+
+    async def _send(self, http: httpx.AsyncClient, batch: List[_Pending]) -> None:
+        if len(batch) > 1:
+            try:
+                resp = await http.post(
+                    f"{settings.ml_service_url}/classify-batch",
+                    data={"params": json.dumps([item.params for item in batch])},
+                    files=[
+                        ("images", (str(i), item.image, item.content_type))
+                        for i, item in enumerate(batch)
+                    ],
+                )
+                resp.raise_for_status()
+                results = resp.json()["results"]
+                if len(results) != len(batch):
+                    raise ValueError(f"{len(results)} results for {len(batch)} images")
+            except Exception:
+                # Don't let one request failure fail every caller in the
+                # batch: fall back to classifying each image on its own
+                logger.warning(
+                    "classify-batch failed; retrying %d images singly", len(batch), exc_info=True
+                )
+            else:
+                for item, candidates in zip(batch, results):
+                    if candidates is None:  # that image could not be decoded
+                        _fail(item, ValueError("ML service could not decode the image"))
+                    else:
+                        _resolve(item, candidates)
+                return
+        await asyncio.gather(*(_classify_one(http, item) for item in batch))
+
+
+def _resolve(item: _Pending, candidates: list) -> None:
+    if not item.future.done():
+        item.future.set_result(candidates)
+
+
+def _fail(item: _Pending, exc: BaseException) -> None:
+    if not item.future.done():
+        item.future.set_exception(exc)
+
+
+async def _classify_one(http: httpx.AsyncClient, item: _Pending) -> None:
+    try:
+        resp = await http.post(
+            f"{settings.ml_service_url}/classify",
+            content=item.image,
+            headers={"Content-Type": item.content_type},
+            params=item.params or None,
+        )
+        resp.raise_for_status()
+        _resolve(item, resp.json().get("candidates", []))
+    except Exception as exc:
+        _fail(item, exc)
+
+
+_batchers: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()  # event loop -> _Batcher
+
+
+async def classify(image: bytes, content_type: str, params: Optional[dict] = None) -> list:
+    """Queue one image for batched classification; returns its top-5 candidates."""
+    loop = asyncio.get_running_loop()
+    batcher = _batchers.get(loop)
+    if batcher is None:
+        batcher = _batchers[loop] = _Batcher(
+            settings.ml_batch_max_size, settings.ml_batch_max_latency_ms / 1000
+        )
+    return await batcher.submit(image, content_type, params or {})
+
+
+async def close() -> None:
+    """Stop the running loop's batcher and forget it."""
+    batcher = _batchers.pop(asyncio.get_running_loop(), None)
+    if batcher is not None:
+        await batcher.aclose()
@@ -1,4 +1,5 @@
 """Harry Potter female character name suggestions for new sharks."""
+from sqlalchemy import or_, select
 from sqlalchemy.orm import Session
 
 HP_NAMES = [
@@ -14,11 +15,16 @@ def suggest_name(db: Session) -> str:
     """Return the first HP name not already used as a shark display_name."""
     from app.models.shark import Shark
 
-    used = {row[0] for row in db.query(Shark.display_name).all()}
+    # Only candidate names are fetched, not every shark's name
+    used = set(db.scalars(select(Shark.display_name).where(Shark.display_name.in_(HP_NAMES))))
     for name in HP_NAMES:
         if name not in used:
             return name
     # All base names taken — append a counter
+    used = set(db.scalars(
+        select(Shark.display_name)
+        .where(or_(*(Shark.display_name.like(f"{name} %") for name in HP_NAMES)))
+    ))
     for i in range(2, 99):
         for name in HP_NAMES:
             candidate = f"{name} {i}"
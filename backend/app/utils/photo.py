@@ -1,20 +1,37 @@
 """Shared photo URL helpers used across multiple routers."""
+from typing import Dict, Iterable, List
+
 from app.config import settings
 from app.models.photo import Photo
 from app.schemas.photo import PhotoOut
-from app.storage.minio import get_presigned_url
+from app.storage.minio import get_presigned_url, get_presigned_urls
 
 
-def photo_url(photo: Photo) -> str | None:
-    """Return the public URL for a photo object, or None on failure."""
+def object_url(object_key: str) -> str | None:
+    """Return the public URL for a stored object key, or None on failure."""
     if settings.photo_base_url:
-        return f"{settings.photo_base_url}/{photo.object_key}"
+        return f"{settings.photo_base_url}/{object_key}"
     try:
-        return get_presigned_url(photo.object_key)
+        return get_presigned_url(object_key)
     except Exception:
         return None
 
 
+def object_urls(object_keys: Iterable[str]) -> Dict[str, str]:
+    """Batch form of object_url(): {object_key: url} for every key that resolves."""
+    if settings.photo_base_url:
+        return {key: f"{settings.photo_base_url}/{key}" for key in object_keys}
+    try:
+        return get_presigned_urls(object_keys)
+    except Exception:
+        return {}
+
+
+def photo_url(photo: Photo) -> str | None:
+    """Return the public URL for a photo object, or None on failure."""
+    return object_url(photo.object_key)
+
+
 def enrich_photo(photo: Photo) -> PhotoOut:
     """Validate photo to PhotoOut schema and inject URL."""
     out = PhotoOut.model_validate(photo)
@@ -22,3 +39,25 @@ def enrich_photo(photo: Photo) -> PhotoOut:
     if url:
         out.url = url
     return out
+
+
+# PhotoOut fields read straight off the ORM row (url is injected separately)
+_PHOTO_OUT_FIELDS = tuple(name for name in PhotoOut.model_fields if name != "url")
+
+
+def photo_out_fast(photo: Photo, url: str | None) -> PhotoOut:
+    """Build PhotoOut from a loaded ORM row without running validation.
+
+    The row's column types already match the schema, so list endpoints use
+    this instead of model_validate(); single-photo endpoints keep validating.
+    """
+    return PhotoOut.model_construct(
+        **{name: getattr(photo, name) for name in _PHOTO_OUT_FIELDS}, url=url
+    )
+
+
+def enrich_photos(photos: Iterable[Photo]) -> List[PhotoOut]:
+    """Batch form of enrich_photo(): signs all URLs in one pass."""
+    photos = list(photos)
+    urls = object_urls(p.object_key for p in photos)
+    return [photo_out_fast(photo, urls.get(photo.object_key)) for photo in photos]
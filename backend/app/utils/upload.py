@@ -0,0 +1,74 @@
+"""Bounded reading of multipart uploads."""
+import re
+from typing import BinaryIO, Optional
+
+from fastapi import UploadFile
+from fastapi.responses import JSONResponse
+
+_READ_CHUNK = 1024 * 1024  # 1 MB
+
+
+async def read_limited(file: UploadFile, max_bytes: int) -> Optional[bytes]:
+    """Read an upload into memory, or return None as soon as it exceeds
+    `max_bytes` — an oversized file is never held in memory in full."""
+    if file.size is not None and file.size > max_bytes:
+        return None
+    data = bytearray()
+    while chunk := await file.read(_READ_CHUNK):
+        data.extend(chunk)
+        if len(data) > max_bytes:
+            return None
+    return bytes(data)
+
+
+class UploadTooLarge(Exception):
+    """Raised by LimitedReader once more than its limit has been read."""
+
+
+class LimitedReader:
+    """File-like wrapper that counts the bytes read through it and raises
+    UploadTooLarge past `max_bytes`, for streaming an upload to storage."""
+
+    def __init__(self, f: BinaryIO, max_bytes: int):
+        self._f = f
+        self._max_bytes = max_bytes
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._f.read(size)
+        self.bytes_read += len(chunk)
+        if self.bytes_read > self._max_bytes:
+            raise UploadTooLarge()
+        return chunk
+
+
+class ContentLengthLimit:
+    """ASGI middleware that answers 413 from the request headers alone when a
+    POST to a path matching `path_pattern` (the whole path) declares a body
+    over `max_bytes`.
+
+    Route handlers only run after the multipart body has been received and
+    spooled, so an oversized upload has to be refused here to save the
+    transfer. Bodies without a Content-Length are still bounded downstream.
+    """
+
+    def __init__(self, app, path_pattern: str, max_bytes: int, detail: str):
+        self.app = app
+        self.path_pattern = re.compile(path_pattern)
+        self.max_bytes = max_bytes
+        self.detail = detail
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] == "http"
+            and scope["method"] == "POST"
+            and self.path_pattern.fullmatch(scope["path"])
+        ):
+            for name, value in scope["headers"]:
+                if name == b"content-length":
+                    if value.isdigit() and int(value) > self.max_bytes:
+                        response = JSONResponse(status_code=413, content={"detail": self.detail})
+                        await response(scope, receive, send)
+                        return
+                    break
+        await self.app(scope, receive, send)
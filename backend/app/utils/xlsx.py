@@ -0,0 +1,185 @@
+"""
+Minimal single-sheet .xlsx writer for flat, high-volume exports.
+
+Emits SpreadsheetML straight into a ZIP instead of going through openpyxl's
+cell objects. Supports what the exports use: inline strings, numbers, one
+styled header row (frozen), fixed column widths and external hyperlinks.
+"""
+import re
+import zipfile
+from typing import IO, Iterable, List, NamedTuple, Sequence
+from xml.sax.saxutils import escape, quoteattr
+
+from openpyxl.utils import get_column_letter
+
+
+class Link(NamedTuple):
+    """Cell value rendered as a hyperlink."""
+    url: str
+    label: str = "Open"
+
+
+# Characters XML 1.0 cannot carry (openpyxl rejects these too)
+_ILLEGAL_XML = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+# Style indexes into cellXfs below
+_XF_HEADER = 1
+_XF_LINK = 2
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>'
+)
+
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    '</Relationships>'
+)
+
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name={name} sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+
+_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="3">'
+    '<font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><color rgb="FFFFFFFF"/><sz val="11"/><name val="Calibri"/></font>'
+    '<font><u/><color rgb="FF2D7DD2"/><sz val="11"/><name val="Calibri"/></font>'
+    '</fonts>'
+    '<fills count="3">'
+    '<fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="FF1B3A5C"/></patternFill></fill>'
+    '</fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="3">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="2" borderId="0" xfId="0" applyFont="1" applyFill="1" '
+    'applyAlignment="1"><alignment horizontal="center"/></xf>'
+    '<xf numFmtId="0" fontId="2" fillId="0" borderId="0" xfId="0" applyFont="1"/>'
+    '</cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+_SHEET_OPEN = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheetViews><sheetView workbookViewId="0">'
+    '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+    '<selection pane="bottomLeft" activeCell="A2" sqref="A2"/>'
+    '</sheetView></sheetViews>'
+)
+
+
+def _text_cell(ref: str, text: str, xf: int = 0) -> str:
+    text = escape(_ILLEGAL_XML.sub("", text))
+    style = f' s="{xf}"' if xf else ""
+    return f'<c r="{ref}"{style} t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def write_xlsx(
+    f: IO[bytes],
+    sheet_title: str,
+    headers: Sequence[str],
+    rows: Iterable[Sequence],
+    widths: Sequence[float],
+    compresslevel: int = 1,
+) -> None:
+    """
+    Write a one-sheet workbook to `f`. Row values may be str, int/float,
+    Link or None/"" (left blank). Rows are serialized one at a time into the
+    deflate stream; `widths` must be known up front since <cols> precedes
+    the sheet data.
+    """
+    letters = [get_column_letter(j) for j in range(1, len(headers) + 1)]
+    links: List[tuple] = []
+
+    with zipfile.ZipFile(f, "w", zipfile.ZIP_DEFLATED, compresslevel=compresslevel) as zf:
+        zf.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        zf.writestr("_rels/.rels", _ROOT_RELS)
+        zf.writestr("xl/workbook.xml", _WORKBOOK.format(name=quoteattr(sheet_title)))
+        zf.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+        zf.writestr("xl/styles.xml", _STYLES)
+
+        with zf.open("xl/worksheets/sheet1.xml", "w") as sheet:
+            parts = [_SHEET_OPEN, "<cols>"]
+            for j, width in enumerate(widths, 1):
+                parts.append(f'<col min="{j}" max="{j}" width="{width}" customWidth="1"/>')
+            parts.append('</cols><sheetData><row r="1">')
+            parts.extend(_text_cell(f"{col}1", h, _XF_HEADER) for col, h in zip(letters, headers))
+            parts.append("</row>")
+            sheet.write("".join(parts).encode())
+
+            for r, row in enumerate(rows, 2):
+                cells = [f'<row r="{r}">']
+                for col, value in zip(letters, row):
+                    ref = f"{col}{r}"
+                    if value is None or value == "":
+                        continue
+                    if isinstance(value, Link):
+                        links.append((ref, value.url))
+                        cells.append(_text_cell(ref, value.label, _XF_LINK))
+                    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                        cells.append(f'<c r="{ref}"><v>{value}</v></c>')
+                    else:
+                        cells.append(_text_cell(ref, str(value)))
+                cells.append("</row>")
+                sheet.write("".join(cells).encode())
+
+            tail = ["</sheetData>"]
+            if links:
+                tail.append("<hyperlinks>")
+                tail.extend(
+                    f'<hyperlink ref="{ref}" r:id="rId{i}"/>' for i, (ref, _) in enumerate(links, 1)
+                )
+                tail.append("</hyperlinks>")
+            tail.append("</worksheet>")
+            sheet.write("".join(tail).encode())
+
+        if links:
+            rels = [
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            ]
+            rels.extend(
+                f'<Relationship Id="rId{i}" '
+                'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink" '
+                f'Target={quoteattr(url)} TargetMode="External"/>'
+                for i, (_, url) in enumerate(links, 1)
+            )
+            rels.append("</Relationships>")
+            zf.writestr("xl/worksheets/_rels/sheet1.xml.rels", "".join(rels))
@@ -6,6 +6,7 @@ Database: SQLite in-memory via StaticPool — all connections share the same
 connection, so background tasks and request handlers see the same data.
 MinIO and the ML httpx calls are fully mocked.
 """
+import asyncio
 import io
 import os
 from unittest.mock import MagicMock, patch
@@ -14,7 +15,7 @@ from unittest.mock import MagicMock, patch
 os.environ.update(
     {
         "DATABASE_URL": "sqlite://",
-        "JWT_SECRET": "test-secret-for-unit-tests-only",
+        "JWT_SECRET": "test-secret-for-unit-tests-only-hs256",
         "MINIO_ENDPOINT": "localhost:9000",
         "MINIO_ROOT_USER": "minioadmin",
         "MINIO_ROOT_PASSWORD": "minioadmin",
@@ -37,6 +38,7 @@ from app.auth.jwt import create_access_token
 from app.database import Base, get_db
 from app.main import app  # triggers all model imports → registers with Base.metadata
 from app.models.user import User
+from app.utils import ml_batch
 
 # ── test engine: single in-memory SQLite connection shared via StaticPool ─────
 TEST_ENGINE = create_engine(
@@ -47,7 +49,7 @@ TEST_ENGINE = create_engine(
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=TEST_ENGINE)
 
 
-# ── stub httpx.Client used by _classify_photo background task ─────────────────
+# ── stub httpx clients used by the ML calls in app.routers.photos ─────────────
 class _MockHttpxClient:
     def __init__(self, *args, **kwargs):
         pass
@@ -62,11 +64,25 @@ class _MockHttpxClient:
         m = MagicMock()
         if "/detect" in url:
             m.json.return_value = {"shark_bbox": None, "zone_bbox": None}
+        elif "/classify-batch" in url:
+            n = len(kwargs.get("files", []))
+            m.json.return_value = {"results": [[] for _ in range(n)]}
         else:
             m.json.return_value = {"candidates": []}
         return m
 
 
+class _MockAsyncHttpxClient(_MockHttpxClient):
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def post(self, url, **kwargs):
+        return _MockHttpxClient.post(self, url, **kwargs)
+
+
 # ── autouse: create / drop tables per test ────────────────────────────────────
 @pytest.fixture(autouse=True)
 def reset_db():
@@ -75,6 +91,26 @@ def reset_db():
     Base.metadata.drop_all(TEST_ENGINE)
 
 
+# ── autouse: auth caches must not leak users between tests ────────────────────
+@pytest.fixture(autouse=True)
+def reset_auth_caches():
+    from app.auth.session_cache import invalidate_user
+    from app.auth.jwt import clear_token_cache
+
+    invalidate_user()
+    clear_token_cache()
+    yield
+
+
+# ── autouse: the validation-queue count cache must not leak between tests ─────
+@pytest.fixture(autouse=True)
+def reset_queue_count_cache():
+    from app.routers.photos import _queue_count_cache
+
+    _queue_count_cache.clear()
+    yield
+
+
 # ── autouse: test DB session + get_db override + bg-task SessionLocal patch ───
 @pytest.fixture(autouse=True)
 def db_session(reset_db):
@@ -96,16 +132,20 @@ def db_session(reset_db):
     # Patch SessionLocal referenced directly in background-task modules
     import app.routers.photos as photos_mod
     import app.routers.videos as videos_mod
+    import app.utils.audit as audit_mod
 
     orig_photos_sl = photos_mod.SessionLocal
     orig_videos_sl = videos_mod.SessionLocal
+    orig_audit_sl = audit_mod.SessionLocal
     photos_mod.SessionLocal = TestingSessionLocal
     videos_mod.SessionLocal = TestingSessionLocal
+    audit_mod.SessionLocal = TestingSessionLocal
 
     yield session
 
     photos_mod.SessionLocal = orig_photos_sl
     videos_mod.SessionLocal = orig_videos_sl
+    audit_mod.SessionLocal = orig_audit_sl
     app.dependency_overrides.pop(get_db, None)
     session.close()
 
@@ -117,24 +157,84 @@ def mock_minio():
     with (
         patch("app.routers.photos.upload_file"),
         patch("app.routers.photos.delete_file"),
+        patch(
+            "app.routers.photos.iter_object",
+            side_effect=lambda key: iter([b"\xff\xd8\xff\xe0" + b"\x00" * 200]),
+        ),
         patch(
             "app.routers.photos.get_object_bytes",
             return_value=b"\xff\xd8\xff\xe0" + b"\x00" * 200,
         ),
         patch("app.routers.videos.upload_file"),
+        patch("app.routers.videos.upload_fileobj"),
         patch("app.routers.videos.delete_file"),
-        patch("app.routers.videos.get_object_bytes", return_value=b""),
+        patch("app.routers.videos.iter_object", side_effect=lambda key: iter([b""])),
     ):
         yield
 
 
-# ── autouse: mock httpx ML calls inside _classify_photo ───────────────────────
+# ── autouse: mock httpx ML calls in app.routers.photos ────────────────────────
 @pytest.fixture(autouse=True)
 def mock_ml():
-    with patch("app.routers.photos.httpx.Client", _MockHttpxClient):
+    with (
+        patch("app.routers.photos.httpx.Client", _MockHttpxClient),
+        patch("app.routers.photos.httpx.AsyncClient", _MockAsyncHttpxClient),
+    ):
         yield
 
 
+# ── scripted ML service: records calls, overrides answers per endpoint ────────
+class _ScriptedML:
+    def __init__(self):
+        self.calls = []       # (url, kwargs) for every POST, in order
+        self._scripts = {}    # endpoint suffix → (json body, raise_for_status error)
+
+    @property
+    def urls(self):
+        return [url for url, _ in self.calls]
+
+    def respond(self, endpoint, json=None, error=None):
+        self._scripts[endpoint] = (json, error)
+
+    def answer(self, url, kwargs, resp):
+        self.calls.append((url, kwargs))
+        for endpoint, (json, error) in self._scripts.items():
+            if url.endswith(endpoint):
+                if json is not None:
+                    resp.json.return_value = json
+                if error is not None:
+                    resp.raise_for_status.side_effect = error
+        return resp
+
+    def run(self, coro_fn):
+        """Run coro_fn() on a fresh loop, releasing its classification batcher."""
+        async def main():
+            try:
+                return await coro_fn()
+            finally:
+                await ml_batch.close()
+        return asyncio.run(main())
+
+    def classify(self, n):
+        """n concurrent classifications; failures are returned, not raised."""
+        return self.run(lambda: asyncio.gather(
+            *(ml_batch.classify(b"img", "image/jpeg") for _ in range(n)), return_exceptions=True,
+        ))
+
+
+@pytest.fixture
+def ml_calls(mock_ml):
+    ml = _ScriptedML()
+
+    class _Client(_MockAsyncHttpxClient):
+        async def post(self, url, **kwargs):
+            return ml.answer(url, kwargs, await super().post(url, **kwargs))
+
+    # httpx is shared by photos and ml_batch, so one patch covers both.
+    with patch("httpx.AsyncClient", _Client):
+        yield ml
+
+
 # ── test client ───────────────────────────────────────────────────────────────
 @pytest.fixture
 def client():
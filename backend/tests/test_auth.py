@@ -75,3 +75,69 @@ def test_admin_only_endpoint_editor(client, editor_headers):
 def test_admin_only_endpoint_admin(client, admin_headers):
     resp = client.get("/users", headers=admin_headers)
     assert resp.status_code == 200
+
+
+def test_tampered_token_rejected(client, admin_token):
+    bad = admin_token[:-2] + ("AA" if not admin_token.endswith("AA") else "BB")
+    for _ in range(2):  # second attempt is served from the negative cache
+        resp = client.get("/locations", headers={"Authorization": f"Bearer {bad}"})
+        assert resp.status_code == 401
+
+
+def test_cached_token_expires(client, admin_user):
+    from app.auth import jwt as jwt_mod
+
+    token = jwt_mod.create_access_token(admin_user.email)
+    assert jwt_mod.decode_token(token) == admin_user.email
+
+    key = jwt_mod.token_key(token)
+    jwt_mod._valid_cache[key] = (admin_user.email, 0)  # expired while cached
+    resp = client.get("/locations", headers={"Authorization": f"Bearer {token}"})
+    assert resp.status_code == 200  # falls through to a real decode
+    assert jwt_mod._valid_cache[key][1] > 0
+
+
+def test_require_role_reuses_dependency():
+    from app.auth.dependencies import require_editor, require_role
+
+    assert require_role("admin", "editor") is require_editor
+
+
+def test_login_is_audited(client, admin_user, admin_headers):
+    client.post("/auth/login", json={"email": "admin@example.com", "password": "adminpass"})
+    events = client.get("/audit-log", headers=admin_headers).json()
+    assert [e["action"] for e in events] == ["auth.login"]
+    assert events[0]["user_email"] == "admin@example.com"
+
+
+def test_log_events_bulk(client, db_session, admin_user, admin_headers):
+    from app.utils.audit import log_events
+
+    log_events(db_session, admin_user, [
+        {"action": "shark.update", "resource_type": "shark"},
+        {"action": "shark.delete", "detail": {"n": 1}},
+    ])
+    db_session.commit()
+
+    events = client.get("/audit-log", headers=admin_headers).json()
+    assert sorted(e["action"] for e in events) == ["shark.delete", "shark.update"]
+    assert all(e["user_email"] == "admin@example.com" for e in events)
+
+
+def test_cors_preflight(client):
+    resp = client.options(
+        "/dive-sessions",
+        headers={
+            "Origin": "http://localhost:5173",
+            "Access-Control-Request-Method": "POST",
+            "Access-Control-Request-Headers": "authorization,content-type",
+        },
+    )
+    assert resp.status_code == 200
+    assert resp.headers["access-control-allow-origin"] == "http://localhost:5173"
+
+    resp = client.options(
+        "/dive-sessions",
+        headers={"Origin": "http://evil.example", "Access-Control-Request-Method": "GET"},
+    )
+    assert resp.status_code == 400
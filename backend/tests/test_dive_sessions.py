@@ -83,3 +83,110 @@ def test_delete_nonexistent(client, editor_headers):
         headers=editor_headers,
     )
     assert resp.status_code == 404
+
+
+def test_list_includes_shark_thumbs(client, editor_headers, tiny_jpeg):
+    session_id = client.post("/dive-sessions", json=_SESSION, headers=editor_headers).json()["id"]
+    photo_id = client.post(
+        f"/dive-sessions/{session_id}/photos",
+        files={"file": ("t.jpg", tiny_jpeg, "image/jpeg")},
+        headers=editor_headers,
+    ).json()["id"]
+    photo = client.post(
+        f"/photos/{photo_id}/validate",
+        json={"action": "create", "shark_name": "Luna"},
+        headers=editor_headers,
+    ).json()
+    client.put(f"/sharks/{photo['shark_id']}", json={"main_photo_id": photo_id}, headers=editor_headers)
+
+    item = client.get("/dive-sessions", headers=editor_headers).json()[0]
+    assert item["shark_count"] == 1
+    assert item["shark_thumbs"] == [f"http://localhost/photos/{photo['object_key']}"]
+
+
+def test_list_caps_shark_thumbs_at_five(client, editor_headers, tiny_jpeg):
+    session_id = client.post("/dive-sessions", json=_SESSION, headers=editor_headers).json()["id"]
+    for i in range(6):
+        photo_id = client.post(
+            f"/dive-sessions/{session_id}/photos",
+            files={"file": ("t.jpg", tiny_jpeg, "image/jpeg")},
+            headers=editor_headers,
+        ).json()["id"]
+        photo = client.post(
+            f"/photos/{photo_id}/validate",
+            json={"action": "create", "shark_name": f"Shark {i}"},
+            headers=editor_headers,
+        ).json()
+        client.put(f"/sharks/{photo['shark_id']}", json={"main_photo_id": photo_id}, headers=editor_headers)
+
+    item = client.get("/dive-sessions", headers=editor_headers).json()[0]
+    assert item["shark_count"] == 6
+    assert len(item["shark_thumbs"]) == 5
+
+
+def test_update_nonexistent(client, editor_headers):
+    resp = client.put(
+        "/dive-sessions/00000000-0000-0000-0000-000000000000",
+        json={"comment": "x"},
+        headers=editor_headers,
+    )
+    assert resp.status_code == 404
+
+
+def test_get_session_detail_with_photos(client, editor_headers, tiny_jpeg):
+    session_id = client.post("/dive-sessions", json=_SESSION, headers=editor_headers).json()["id"]
+    for _ in range(2):
+        client.post(
+            f"/dive-sessions/{session_id}/photos",
+            files={"file": ("t.jpg", tiny_jpeg, "image/jpeg")},
+            headers=editor_headers,
+        )
+
+    data = client.get(f"/dive-sessions/{session_id}", headers=editor_headers).json()
+    assert data["photo_count"] == 2
+    assert all(p["url"] for p in data["photos"])
+    assert data["observation_count"] == 0
+    assert data["queue_count"] == 2
+    assert data["shark_count"] == 0
+
+
+def test_list_counts_queue_photos(client, editor_headers, tiny_jpeg):
+    session_id = client.post("/dive-sessions", json=_SESSION, headers=editor_headers).json()["id"]
+    client.post(
+        f"/dive-sessions/{session_id}/photos",
+        files={"file": ("t.jpg", tiny_jpeg, "image/jpeg")},
+        headers=editor_headers,
+    )
+    item = client.get("/dive-sessions", headers=editor_headers).json()[0]
+    assert item["queue_count"] == 1
+    assert item["shark_count"] == 0
+
+
+def test_list_sessions_keyset_pagination(client, editor_headers):
+    for day in (1, 2, 3):
+        client.post(
+            "/dive-sessions", json={"started_at": f"2024-01-0{day}T10:00:00Z"}, headers=editor_headers
+        )
+
+    first = client.get("/dive-sessions", params={"limit": 2}, headers=editor_headers).json()
+    assert [s["started_at"][:10] for s in first] == ["2024-01-03", "2024-01-02"]
+
+    last = first[-1]
+    rest = client.get(
+        "/dive-sessions",
+        params={"limit": 2, "after_started_at": last["started_at"], "after_id": last["id"]},
+        headers=editor_headers,
+    ).json()
+    assert [s["started_at"][:10] for s in rest] == ["2024-01-01"]
+
+
+def test_list_sessions_rejects_bad_paging(client, editor_headers):
+    for params in (
+        {"limit": 0},
+        {"limit": -1},
+        {"limit": 100_000},
+        {"after_started_at": "2024-01-01T10:00:00Z"},
+        {"after_id": "00000000-0000-0000-0000-000000000000"},
+    ):
+        resp = client.get("/dive-sessions", params=params, headers=editor_headers)
+        assert resp.status_code == 422, params
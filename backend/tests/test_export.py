@@ -0,0 +1,118 @@
+"""
+Excel export tests — role gating and workbook contents.
+"""
+import io
+
+from openpyxl import load_workbook
+
+_SESSION = {"started_at": "2024-03-01T08:00:00Z", "comment": "Reef"}
+_XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def _rows(resp):
+    ws = load_workbook(io.BytesIO(resp.content)).active
+    return [[c.value for c in row] for row in ws.iter_rows()]
+
+
+def _linked_photo(client, headers, tiny_jpeg, shark_name="Luna"):
+    session_id = client.post("/dive-sessions", json=_SESSION, headers=headers).json()["id"]
+    photo_id = client.post(
+        f"/dive-sessions/{session_id}/photos",
+        files={"file": ("t.jpg", tiny_jpeg, "image/jpeg")},
+        headers=headers,
+    ).json()["id"]
+    photo = client.post(
+        f"/photos/{photo_id}/validate",
+        json={"action": "create", "shark_name": shark_name},
+        headers=headers,
+    ).json()
+    return session_id, photo
+
+
+def test_viewer_cannot_export(client, viewer_headers):
+    for url in ("/sharks/export", "/dive-sessions/export"):
+        assert client.get(url, headers=viewer_headers).status_code == 403
+
+
+def test_export_sharks(client, editor_headers, tiny_jpeg):
+    _, photo = _linked_photo(client, editor_headers, tiny_jpeg)
+    client.put(f"/sharks/{photo['shark_id']}", json={"main_photo_id": photo["id"]}, headers=editor_headers)
+
+    resp = client.get("/sharks/export", headers=editor_headers)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == _XLSX
+    assert int(resp.headers["content-length"]) == len(resp.content)
+    rows = _rows(resp)
+    assert rows[0] == ["Name", "Status", "First Seen", "Last Seen", "Observations", "Added", "Main Photo"]
+    assert rows[1][0] == "Luna"
+    assert rows[1][4] == 1
+    assert rows[1][6] == "Photo"
+
+    ws = load_workbook(io.BytesIO(resp.content)).active
+    assert ws.freeze_panes == "A2"
+    assert ws.column_dimensions["E"].width == len("Observations") + 4
+    assert ws.cell(2, 7).hyperlink.target.startswith("http://localhost/photos/")
+
+
+def test_export_shark_detail(client, editor_headers, tiny_jpeg):
+    session_id, photo = _linked_photo(client, editor_headers, tiny_jpeg, "Cho Chang")
+
+    resp = client.get(f"/sharks/{photo['shark_id']}/export", headers=editor_headers)
+    assert resp.status_code == 200
+    assert 'filename="shark_Cho_Chang.xlsx"' in resp.headers["content-disposition"]
+    rows = _rows(resp)
+    assert len(rows) == 2
+    assert rows[1][2] == session_id
+    assert rows[1][4] == "No"
+
+
+def test_export_shark_detail_ascii_filename(client, editor_headers, tiny_jpeg):
+    _, photo = _linked_photo(client, editor_headers, tiny_jpeg, "Zoë Ñandú")
+
+    resp = client.get(f"/sharks/{photo['shark_id']}/export", headers=editor_headers)
+    assert 'filename="shark_Zoe_Nandu.xlsx"' in resp.headers["content-disposition"]
+
+
+def test_export_sessions(client, editor_headers, tiny_jpeg):
+    _linked_photo(client, editor_headers, tiny_jpeg)
+
+    rows = _rows(client.get("/dive-sessions/export", headers=editor_headers))
+    assert rows[0] == ["Started", "Ended", "Location", "Comment", "Photos", "Queue", "Sharks"]
+    assert rows[1][3] == "Reef"
+    assert rows[1][4:] == [1, 0, 1]
+
+
+def test_export_session_detail(client, editor_headers, tiny_jpeg):
+    session_id, _ = _linked_photo(client, editor_headers, tiny_jpeg)
+
+    resp = client.get(f"/dive-sessions/{session_id}/export", headers=editor_headers)
+    assert resp.status_code == 200
+    assert 'filename="session_2024-03-01.xlsx"' in resp.headers["content-disposition"]
+    rows = _rows(resp)
+    assert rows[1][1:3] == ["validated", "Luna"]
+    assert rows[1][7] == "Draft"
+
+
+def test_export_not_found(client, editor_headers):
+    missing = "00000000-0000-0000-0000-000000000000"
+    assert client.get(f"/sharks/{missing}/export", headers=editor_headers).status_code == 404
+    assert client.get(f"/dive-sessions/{missing}/export", headers=editor_headers).status_code == 404
+
+
+def test_export_sessions_location_name(client, editor_headers):
+    loc_id = client.post(
+        "/locations", json={"country": "Mexico", "spot_name": "Guadalupe"}, headers=editor_headers
+    ).json()["id"]
+    client.post("/dive-sessions", json={**_SESSION, "location_id": loc_id}, headers=editor_headers)
+    client.post("/dive-sessions", json={"started_at": "2024-02-01T08:00:00Z"}, headers=editor_headers)
+
+    rows = _rows(client.get("/dive-sessions/export", headers=editor_headers))
+    assert [r[2] for r in rows[1:]] == ["Guadalupe, Mexico", None]  # "" reads back as an empty cell
+
+
+def test_export_sessions_escapes_text(client, editor_headers):
+    comment = 'Mantas & "hammerheads" <30m>'
+    client.post("/dive-sessions", json={**_SESSION, "comment": comment}, headers=editor_headers)
+
+    rows = _rows(client.get("/dive-sessions/export", headers=editor_headers))
+    assert rows[1][3] == comment
@@ -4,7 +4,21 @@ Item 58 — integration tests: photo upload → classification → validation.
 Background tasks (classification) run synchronously in Starlette's TestClient.
 MinIO and ML httpx calls are mocked via autouse conftest fixtures.
 """
+import asyncio
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import httpx
 import pytest
+from botocore.exceptions import ClientError
+from sqlalchemy import event
+
+from app.config import settings
+from app.models.photo import Photo, ProcessingStatus
+from app.storage import minio
+from app.utils import ml_batch
+from tests.conftest import TEST_ENGINE
 
 _SESSION_BODY = {"started_at": "2024-06-01T09:00:00Z"}
 _SHARK_BODY = {"display_name": "Dotty", "name_status": "temporary"}
@@ -51,6 +65,25 @@ def test_upload_png(client, editor_headers, tiny_png):
     assert resp.json()["content_type"] == "image/png"
 
 
+def test_upload_storage_failure_creates_no_photo(client, editor_headers, tiny_jpeg):
+    """MinIO upload runs inside the request, before the row is written."""
+    session_id = _create_session(client, editor_headers)
+    with patch("app.routers.photos.upload_file", side_effect=OSError("minio down")):
+        with pytest.raises(OSError):
+            _upload_photo(client, editor_headers, session_id, tiny_jpeg)
+    session = client.get(f"/dive-sessions/{session_id}", headers=editor_headers).json()
+    assert session["photo_count"] == 0
+
+
+def test_upload_classifies_without_refetching(client, editor_headers, tiny_jpeg):
+    """The background task classifies the uploaded bytes it already holds."""
+    session_id = _create_session(client, editor_headers)
+    with patch("app.routers.photos.get_object_bytes") as fetch:
+        resp = _upload_photo(client, editor_headers, session_id, tiny_jpeg)
+    assert resp.status_code == 201
+    fetch.assert_not_called()
+
+
 def test_upload_too_large(client, editor_headers):
     session_id = _create_session(client, editor_headers)
     large_data = b"x" * (50 * 1024 * 1024 + 1)
@@ -59,7 +92,7 @@ def test_upload_too_large(client, editor_headers):
 
 
 def test_upload_invalid_file(client, editor_headers):
-    """Non-image bytes with image/jpeg content type → PIL.verify() rejects it."""
+    """Non-image bytes with image/jpeg content type → signature check rejects it."""
     session_id = _create_session(client, editor_headers)
     resp = _upload_photo(
         client, editor_headers, session_id, b"not an image at all"
@@ -67,6 +100,13 @@ def test_upload_invalid_file(client, editor_headers):
     assert resp.status_code == 422
 
 
+def test_upload_png_declared_as_jpeg(client, editor_headers, tiny_png):
+    """PNG bytes sent as image/jpeg → JPEG signature check rejects it."""
+    session_id = _create_session(client, editor_headers)
+    resp = _upload_photo(client, editor_headers, session_id, tiny_png)
+    assert resp.status_code == 422
+
+
 def test_upload_wrong_content_type(client, editor_headers):
     """text/plain content type → rejected before PIL check."""
     session_id = _create_session(client, editor_headers)
@@ -153,6 +193,47 @@ def test_validate_create_new_shark(client, editor_headers, tiny_jpeg):
     assert any(s["display_name"] == "Brand New Shark" for s in sharks)
 
 
+def test_validate_create_inserts_shark_before_dependents(client, editor_headers, tiny_jpeg):
+    session_id = _create_session(client, editor_headers)
+    photo_id = _upload_photo(client, editor_headers, session_id, tiny_jpeg).json()["id"]
+
+    writes = []
+
+    def listener(conn, cursor, statement, *args):
+        if statement.startswith(("INSERT", "UPDATE")):
+            writes.append(" ".join(statement.split()[:3]))
+
+    event.listen(TEST_ENGINE, "before_cursor_execute", listener)
+    try:
+        resp = client.post(f"/photos/{photo_id}/validate",
+                           json={"action": "create", "shark_name": "Nova"}, headers=editor_headers)
+    finally:
+        event.remove(TEST_ENGINE, "before_cursor_execute", listener)
+    assert resp.status_code == 200
+    # Postgres checks the FKs per statement, so the shark must exist first
+    assert writes.index("INSERT INTO sharks") < writes.index("INSERT INTO observations")
+    assert writes.index("INSERT INTO sharks") < writes.index("UPDATE photos SET")
+
+
+def test_validate_observation_takes_session_location(client, editor_headers, tiny_jpeg):
+    loc_id = client.post(
+        "/locations", json={"country": "Mexico", "spot_name": "Guadalupe"}, headers=editor_headers
+    ).json()["id"]
+    session_id = client.post(
+        "/dive-sessions", json={**_SESSION_BODY, "location_id": loc_id}, headers=editor_headers
+    ).json()["id"]
+    photo_id = _upload_photo(client, editor_headers, session_id, tiny_jpeg).json()["id"]
+
+    client.post(
+        f"/photos/{photo_id}/validate",
+        json={"action": "create", "shark_name": "Located Shark"},
+        headers=editor_headers,
+    )
+
+    observations = client.get(f"/dive-sessions/{session_id}", headers=editor_headers).json()["observations"]
+    assert [o["location_id"] for o in observations] == [loc_id]
+
+
 def test_validate_unlink(client, editor_headers, tiny_jpeg):
     session_id = _create_session(client, editor_headers)
     photo_id = _upload_photo(client, editor_headers, session_id, tiny_jpeg).json()["id"]
@@ -224,11 +305,9 @@ def test_recheck_unlinked_photo(client, editor_headers, tiny_jpeg):
 
 
 def test_recheck_error_photo(client, editor_headers, db_session, tiny_jpeg):
-    import uuid as _uuid
-    from app.models.photo import Photo, ProcessingStatus
     session_id = _create_session(client, editor_headers)
     photo_id = _upload_photo(client, editor_headers, session_id, tiny_jpeg).json()["id"]
-    photo = db_session.get(Photo, _uuid.UUID(photo_id))
+    photo = db_session.get(Photo, uuid.UUID(photo_id))
     photo.processing_status = ProcessingStatus.error
     photo.shark_id = None
     db_session.commit()
@@ -244,3 +323,83 @@ def test_recheck_linked_photo_returns_409(client, editor_headers, tiny_jpeg):
                 json={"action": "confirm", "shark_id": shark_id}, headers=editor_headers)
     resp = client.post(f"/photos/{photo_id}/recheck", headers=editor_headers)
     assert resp.status_code == 409
+
+
+# ── add to model ──────────────────────────────────────────────────────────────
+
+
+def test_add_to_model_storage_failure_is_not_an_ml_error(client, editor_headers, tiny_jpeg):
+    session_id = _create_session(client, editor_headers)
+    photo_id = _upload_photo(client, editor_headers, session_id, tiny_jpeg).json()["id"]
+    shark_id = client.post("/sharks", json=_SHARK_BODY, headers=editor_headers).json()["id"]
+    client.post(f"/photos/{photo_id}/validate",
+                json={"action": "confirm", "shark_id": shark_id}, headers=editor_headers)
+
+    missing = ClientError({"Error": {"Code": "NoSuchKey", "Message": "secret-bucket/key"}}, "GetObject")
+    with patch("app.routers.photos.iter_object", side_effect=missing):
+        resp = client.post(f"/photos/{photo_id}/add-to-model", headers=editor_headers)
+    assert resp.status_code == 502
+    assert resp.json() == {"detail": "Photo storage error"}
+
+
+# ── ML micro-batching ─────────────────────────────────────────────────────────
+
+
+def test_concurrent_classifications_share_one_batch_request(ml_calls):
+    assert ml_calls.classify(3) == [[], [], []]
+    assert ml_calls.urls == ["http://ml:8001/classify-batch"]
+
+
+def test_cancelled_classification_is_not_sent(ml_calls):
+    async def scenario():
+        speculative = asyncio.ensure_future(ml_batch.classify(b"img", "image/jpeg"))
+        await asyncio.sleep(0)  # queued, waiting for the batch to fill
+        speculative.cancel()
+        await asyncio.sleep(0.2)  # past the batching window
+
+    ml_calls.run(scenario)
+    assert ml_calls.urls == []
+
+
+def test_undecodable_image_fails_only_its_own_classification(ml_calls):
+    ml_calls.respond("/classify-batch", json={"results": [None, [], []]})
+    results = ml_calls.classify(3)
+    assert isinstance(results[0], ValueError)
+    assert results[1:] == [[], []]
+
+
+def test_failed_batch_request_retries_images_singly(ml_calls):
+    ml_calls.respond("/classify-batch", error=httpx.HTTPError("500"))
+    assert ml_calls.classify(3) == [[], [], []]
+    assert ml_calls.urls[0].endswith("/classify-batch")
+    assert sum(url.endswith("/classify") for url in ml_calls.urls) == 3
+
+
+def test_classify_redone_after_detect_finds_bboxes(client, editor_headers, tiny_jpeg, ml_calls):
+    """/classify runs speculatively alongside /detect; detected boxes win."""
+    box = {"x": 0.1, "y": 0.1, "w": 0.5, "h": 0.5}
+    ml_calls.respond("/detect", json={"shark_bbox": box, "zone_bbox": box})
+
+    session_id = _create_session(client, editor_headers)
+    photo_id = _upload_photo(client, editor_headers, session_id, tiny_jpeg).json()["id"]
+
+    photo = client.get(f"/photos/{photo_id}", headers=editor_headers).json()
+    assert photo["processing_status"] == "ready_for_validation"
+    assert photo["shark_bbox"] == box and photo["auto_detected"] is True
+    classify_params = [kw.get("params") for url, kw in ml_calls.calls if url.endswith("/classify")]
+    assert classify_params[-1]["shark_x"] == box["x"]
+
+
+def test_batch_presigned_urls_match_client_signing():
+    """The shared-signer batch path yields the same URLs as boto3's own."""
+    keys = ["photos/a/1.jpg", "videos/b c/ü~+=.mp4"]
+    fixed = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    with patch("botocore.auth.get_current_datetime", return_value=fixed):
+        batch = minio._sign_many(keys, 3600)
+        single = {
+            key: minio._client().generate_presigned_url(
+                "get_object", Params={"Bucket": settings.minio_bucket, "Key": key}, ExpiresIn=3600
+            )
+            for key in keys
+        }
+    assert batch == single
@@ -1,6 +1,9 @@
 """
 Item 57 — shark CRUD tests.
 """
+from sqlalchemy import event
+
+from tests.conftest import TEST_ENGINE
 
 _SHARK = {"display_name": "Hermione", "name_status": "temporary"}
 
@@ -34,6 +37,110 @@ def test_get_shark_detail(client, editor_headers):
     assert data["all_photos"] == []
 
 
+def test_get_shark_first_last_seen(client, editor_headers, db_session):
+    import uuid
+    from datetime import datetime, timezone
+    from app.models.observation import Observation
+
+    shark_id = client.post("/sharks", json=_SHARK, headers=editor_headers).json()["id"]
+    session_id = client.post(
+        "/dive-sessions", json={"started_at": "2024-03-01T08:00:00Z"}, headers=editor_headers
+    ).json()["id"]
+    for taken_at in (datetime(2024, 3, 1, tzinfo=timezone.utc), None,
+                     datetime(2024, 5, 1, tzinfo=timezone.utc), datetime(2024, 4, 1, tzinfo=timezone.utc)):
+        db_session.add(Observation(
+            dive_session_id=uuid.UUID(session_id), shark_id=uuid.UUID(shark_id), taken_at=taken_at,
+        ))
+    db_session.commit()
+
+    data = client.get(f"/sharks/{shark_id}", headers=editor_headers).json()
+    assert data["sighting_count"] == 4
+    assert data["first_seen"].startswith("2024-03-01")
+    assert data["last_seen"].startswith("2024-05-01")
+
+    # Truncated list: stats still cover every observation
+    data = client.get(
+        f"/sharks/{shark_id}", params={"observations_limit": 1}, headers=editor_headers
+    ).json()
+    assert [o["taken_at"][:10] for o in data["observations"]] == ["2024-05-01"]
+    assert data["sighting_count"] == 4
+    assert data["first_seen"].startswith("2024-03-01")
+    assert data["last_seen"].startswith("2024-05-01")
+
+    for bad in (0, -1, 100_000):
+        resp = client.get(
+            f"/sharks/{shark_id}", params={"observations_limit": bad}, headers=editor_headers
+        )
+        assert resp.status_code == 422
+
+
+def test_get_shark_detail_photos_batched(client, editor_headers, tiny_jpeg):
+    session_id = client.post(
+        "/dive-sessions", json={"started_at": "2024-03-01T08:00:00Z"}, headers=editor_headers
+    ).json()["id"]
+    photo_id = client.post(
+        f"/dive-sessions/{session_id}/photos",
+        files={"file": ("t.jpg", tiny_jpeg, "image/jpeg")},
+        headers=editor_headers,
+    ).json()["id"]
+    shark_id = client.post(
+        f"/photos/{photo_id}/validate",
+        json={"action": "create", "shark_name": "Luna"},
+        headers=editor_headers,
+    ).json()["shark_id"]
+    client.put(f"/sharks/{shark_id}", json={"main_photo_id": photo_id}, headers=editor_headers)
+
+    statements = []
+
+    def listener(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(TEST_ENGINE, "before_cursor_execute", listener)
+    try:
+        resp = client.get(f"/sharks/{shark_id}", headers=editor_headers)
+    finally:
+        event.remove(TEST_ENGINE, "before_cursor_execute", listener)
+
+    data = resp.json()
+    assert [p["id"] for p in data["all_photos"]] == [photo_id]
+    assert data["main_photo_url"] == data["all_photos"][0]["url"]
+    assert len(statements) <= 2  # shark + photos, observations
+
+
+def test_list_sharks_main_photo_url(client, editor_headers, tiny_jpeg):
+    session_id = client.post(
+        "/dive-sessions", json={"started_at": "2024-03-01T08:00:00Z"}, headers=editor_headers
+    ).json()["id"]
+    photo = client.post(
+        f"/dive-sessions/{session_id}/photos",
+        files={"file": ("t.jpg", tiny_jpeg, "image/jpeg")},
+        headers=editor_headers,
+    ).json()
+    shark_id = client.post(
+        f"/photos/{photo['id']}/validate",
+        json={"action": "create", "shark_name": "Luna"},
+        headers=editor_headers,
+    ).json()["shark_id"]
+    client.put(f"/sharks/{shark_id}", json={"main_photo_id": photo["id"]}, headers=editor_headers)
+
+    statements = []
+
+    def listener(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(TEST_ENGINE, "before_cursor_execute", listener)
+    try:
+        sharks = client.get("/sharks", headers=editor_headers).json()
+    finally:
+        event.remove(TEST_ENGINE, "before_cursor_execute", listener)
+    assert sharks[0]["main_photo_url"] == photo["url"]
+    assert len(statements) == 1  # sharks LEFT JOIN photos
+
+    bare = client.get("/sharks?expand_main_photo=false", headers=editor_headers).json()
+    assert bare[0]["main_photo_id"] == photo["id"]
+    assert bare[0]["main_photo_url"] is None
+
+
 def test_update_shark(client, editor_headers):
     resp = client.post("/sharks", json=_SHARK, headers=editor_headers)
     shark_id = resp.json()["id"]
@@ -67,6 +174,20 @@ def test_suggest_name(client, editor_headers):
     assert len(resp.json()["name"]) > 0
 
 
+def test_suggest_name_skips_used_names(client, editor_headers):
+    from app.utils.names import HP_NAMES
+
+    for name in HP_NAMES[:2] + ["Unrelated"]:
+        client.post("/sharks", json={"display_name": name, "name_status": "temporary"},
+                    headers=editor_headers)
+    assert client.get("/sharks/suggest-name", headers=editor_headers).json()["name"] == HP_NAMES[2]
+
+    for name in HP_NAMES[2:] + [f"{HP_NAMES[0]} 2"]:
+        client.post("/sharks", json={"display_name": name, "name_status": "temporary"},
+                    headers=editor_headers)
+    assert client.get("/sharks/suggest-name", headers=editor_headers).json()["name"] == f"{HP_NAMES[1]} 2"
+
+
 def test_search_by_name(client, editor_headers):
     client.post("/sharks", json=_SHARK, headers=editor_headers)
     client.post(
@@ -72,6 +72,27 @@ def test_admin_update_role(client, admin_headers, editor_user):
     assert resp.json()["role"] == "viewer"
 
 
+def test_update_user_duplicate_email(client, admin_headers, admin_user, editor_user):
+    resp = client.put(
+        f"/users/{editor_user.id}",
+        json={"email": "admin@example.com"},
+        headers=admin_headers,
+    )
+    assert resp.status_code == 409
+
+
+def test_role_change_applies_to_live_token(client, admin_headers, editor_headers, editor_user):
+    # Warm the user cache with the editor role
+    assert client.post(
+        "/locations", json={"country": "A", "spot_name": "B"}, headers=editor_headers
+    ).status_code == 201
+
+    client.put(f"/users/{editor_user.id}", json={"role": "viewer"}, headers=admin_headers)
+
+    resp = client.post("/locations", json={"country": "A", "spot_name": "C"}, headers=editor_headers)
+    assert resp.status_code == 403
+
+
 def test_admin_reset_password(client, admin_headers, editor_user):
     resp = client.put(
         f"/users/{editor_user.id}",
@@ -93,6 +114,12 @@ def test_admin_delete_user(client, admin_headers, editor_user):
     assert not any(u["email"] == "editor@example.com" for u in users)
 
 
+def test_deleted_user_token_rejected(client, admin_headers, editor_headers, editor_user):
+    assert client.get("/users/me", headers=editor_headers).status_code == 200
+    client.delete(f"/users/{editor_user.id}", headers=admin_headers)
+    assert client.get("/users/me", headers=editor_headers).status_code == 401
+
+
 def test_admin_self_delete_returns_409(client, admin_headers, admin_user):
     resp = client.delete(f"/users/{admin_user.id}", headers=admin_headers)
     assert resp.status_code == 409
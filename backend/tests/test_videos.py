@@ -0,0 +1,144 @@
+"""
+Videos: job claiming, resume after restart, listing, deletion and upload limits.
+
+The ML /process-video call is replaced by patching _extract_frames.
+"""
+import base64
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.models.photo import Photo
+from app.models.video import Video, VideoStatus
+from app.routers import videos
+from app.utils import ml_batch
+from app.utils.upload import ContentLengthLimit
+
+
+def _video(db_session, client, headers, status=VideoStatus.uploaded, age=timedelta(hours=1)):
+    session_id = client.post(
+        "/dive-sessions", json={"started_at": "2024-06-01T09:00:00Z"}, headers=headers
+    ).json()["id"]
+    video = Video(
+        object_key=f"videos/{session_id}/v.mp4", content_type="video/mp4", size=1,
+        dive_session_id=uuid.UUID(session_id), processing_status=status,
+        uploaded_at=datetime.now(timezone.utc) - age,
+    )
+    db_session.add(video)
+    db_session.commit()
+    return video.id
+
+
+def _frames(jpeg, n):
+    return [{"jpeg": base64.b64encode(jpeg).decode(), "shark_bbox": None, "zone_bbox": None}] * n
+
+
+def test_resume_processes_dropped_uploads(client, editor_headers, db_session, tiny_jpeg):
+    video_id = _video(db_session, client, editor_headers)
+    fresh_id = _video(db_session, client, editor_headers, age=timedelta(seconds=5))
+    batchers = len(ml_batch._batchers)
+    with patch.object(videos, "_extract_frames", return_value=_frames(tiny_jpeg, 2)):
+        videos.resume_pending_videos()
+    assert len(ml_batch._batchers) == batchers  # the per-video loop's batcher was released
+
+    db_session.expire_all()
+    video = db_session.get(Video, video_id)
+    assert video.processing_status == VideoStatus.done
+    assert video.frames_extracted == 2
+    assert db_session.query(Photo).count() == 2
+    # A fresh upload is left to the background task of the worker that took it.
+    assert db_session.get(Video, fresh_id).processing_status == VideoStatus.uploaded
+
+
+def test_resume_fails_only_stale_claims(client, editor_headers, db_session):
+    now = datetime.now(timezone.utc)
+    stale_id = _video(db_session, client, editor_headers, status=VideoStatus.processing)
+    live_id = _video(db_session, client, editor_headers, status=VideoStatus.processing)
+    db_session.get(Video, stale_id).claimed_at = now - timedelta(seconds=settings.video_job_timeout + 60)
+    db_session.get(Video, live_id).claimed_at = now - timedelta(minutes=3)  # a peer mid-job
+    db_session.commit()
+
+    with patch.object(videos, "_extract_frames") as extract:
+        videos.resume_pending_videos()
+    extract.assert_not_called()
+
+    db_session.expire_all()
+    assert db_session.get(Video, stale_id).processing_status == VideoStatus.error
+    assert db_session.get(Video, live_id).processing_status == VideoStatus.processing
+
+
+def test_claimed_video_is_not_processed_twice(client, editor_headers, db_session, tiny_jpeg):
+    video_id = _video(db_session, client, editor_headers, status=VideoStatus.processing)
+    with patch.object(videos, "_extract_frames", return_value=_frames(tiny_jpeg, 1)) as extract:
+        videos._process_video(video_id)
+    extract.assert_not_called()
+    assert db_session.query(Photo).count() == 0
+
+
+def test_delete_video_scoped_to_session(client, editor_headers, db_session):
+    video_id = _video(db_session, client, editor_headers)
+    session_id = db_session.get(Video, video_id).dive_session_id
+    other = client.post(
+        "/dive-sessions", json={"started_at": "2024-06-02T09:00:00Z"}, headers=editor_headers
+    ).json()["id"]
+
+    resp = client.delete(f"/dive-sessions/{other}/videos/{video_id}", headers=editor_headers)
+    assert resp.status_code == 404
+
+    resp = client.delete(f"/dive-sessions/{session_id}/videos/{video_id}", headers=editor_headers)
+    assert resp.status_code == 204
+    db_session.expire_all()
+    assert db_session.get(Video, video_id) is None
+
+
+def test_list_videos(client, editor_headers, db_session):
+    video_id = _video(db_session, client, editor_headers)
+    session_id = db_session.get(Video, video_id).dive_session_id
+
+    data = client.get(f"/dive-sessions/{session_id}/videos", headers=editor_headers).json()
+    assert [v["id"] for v in data] == [str(video_id)]
+    assert data[0]["processing_status"] == "uploaded"
+
+
+def test_oversized_upload_refused_from_headers():
+    received = []
+    inner = FastAPI()
+
+    @inner.post("/dive-sessions/{session_id}/videos")
+    @inner.post("/admin/videos")
+    async def _upload(request: Request):
+        received.append(await request.body())
+        return {}
+
+    app = ContentLengthLimit(
+        inner, path_pattern=videos.UPLOAD_PATH_PATTERN, max_bytes=10, detail="too big"
+    )
+    with TestClient(app) as small:
+        resp = small.post("/dive-sessions/s1/videos", content=b"x" * 11)
+        assert resp.status_code == 413
+        assert resp.json() == {"detail": "too big"}
+        assert received == []
+        assert small.post("/dive-sessions/s1/videos", content=b"x" * 10).status_code == 200
+        # Only the upload route is guarded, not every path ending in /videos.
+        assert small.post("/admin/videos", content=b"x" * 11).status_code == 200
+
+
+def test_upload_handler_checks_declared_size(client, editor_headers):
+    session_id = client.post(
+        "/dive-sessions", json={"started_at": "2024-06-01T09:00:00Z"}, headers=editor_headers
+    ).json()["id"]
+    with (
+        patch.object(videos, "MAX_VIDEO_BYTES", 10),  # below the middleware's limit
+        patch("app.routers.videos.upload_fileobj") as upload,
+    ):
+        resp = client.post(
+            f"/dive-sessions/{session_id}/videos",
+            files={"file": ("v.mp4", b"x" * 100, "video/mp4")},
+            headers=editor_headers,
+        )
+    assert resp.status_code == 413
+    upload.assert_not_called()
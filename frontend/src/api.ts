@@ -208,7 +208,8 @@ export const getAuditLog = (params?: {
   resource_type?: string
   resource_id?: string
   limit?: number
-  offset?: number
+  after_created_at?: string
+  after_id?: string
 }) => {
   const qs = new URLSearchParams(
     Object.fromEntries(
@@ -40,27 +40,26 @@ export default function AuditLog() {
   usePageTitle('Audit Log')
   const [events, setEvents] = useState<AuditEvent[]>([])
   const [loading, setLoading] = useState(true)
-  const [offset, setOffset] = useState(0)
   const [hasMore, setHasMore] = useState(false)
 
   useEffect(() => {
     setLoading(true)
-    getAuditLog({ limit: PAGE_SIZE, offset: 0 })
+    getAuditLog({ limit: PAGE_SIZE })
       .then(data => {
         setEvents(data)
         setHasMore(data.length === PAGE_SIZE)
-        setOffset(PAGE_SIZE)
       })
       .catch(() => {})
       .finally(() => setLoading(false))
   }, [])
 
   const loadMore = () => {
-    getAuditLog({ limit: PAGE_SIZE, offset })
+    const last = events[events.length - 1]
+    if (!last) return
+    getAuditLog({ limit: PAGE_SIZE, after_created_at: last.created_at, after_id: last.id })
       .then(data => {
         setEvents(prev => [...prev, ...data])
         setHasMore(data.length === PAGE_SIZE)
-        setOffset(o => o + PAGE_SIZE)
       })
       .catch(() => {})
   }
@@ -76,3 +76,18 @@ def extract_embedding(img: Image.Image) -> np.ndarray:
     if norm > 0.0:
         feat /= norm
     return feat
+
+
+def extract_embeddings(imgs: list[Image.Image]) -> np.ndarray:
+    """Batch form of extract_embedding(): one inference call for all *imgs*.
+
+    Returns an (N, 1280) float32 array of L2-normalised rows. The exported
+    model has a dynamic batch axis, so N crops cost one session.run.
+    """
+    session = _get_session()
+    inp = np.concatenate([_preprocess(img) for img in imgs])   # (N, 3, H, W)
+    input_name = session.get_inputs()[0].name
+    feats = session.run(None, {input_name: inp})[0].astype(np.float32)   # (N, 1280)
+    norms = np.linalg.norm(feats, axis=1, keepdims=True)
+    np.divide(feats, norms, out=feats, where=norms > 0.0)
+    return feats
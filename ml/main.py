@@ -1,3 +1,4 @@
+import json
 import os
 from io import BytesIO
 from typing import Optional
@@ -8,7 +9,7 @@ from PIL import Image
 from classifier import find_candidates
 from detector import auto_detect, crop_shark_with_auto_zone, crop_zone, detect_snout
 from video import extract_shark_frames
-from embedder import EMBEDDING_DIM, extract_embedding
+from embedder import EMBEDDING_DIM, extract_embedding, extract_embeddings
 from store import get_store
 
 ML_CONFIDENCE_THRESHOLD = float(os.getenv("ML_CONFIDENCE_THRESHOLD", "0.5"))
@@ -16,6 +17,31 @@ ML_CONFIDENCE_THRESHOLD = float(os.getenv("ML_CONFIDENCE_THRESHOLD", "0.5"))
 app = FastAPI(title="SharkID ML Service", version="0.1.0")
 
 
+def _open_image(data: bytes) -> Image.Image:
+    try:
+        return Image.open(BytesIO(data))
+    except Exception:
+        raise HTTPException(status_code=422, detail="Cannot decode image")
+
+
+def _classify_region(img: Image.Image, params: dict) -> Image.Image:
+    """Pick the crop to embed: annotated zone, shark box + auto zone, or snout heuristic."""
+    shark = [params.get(k) for k in ("shark_x", "shark_y", "shark_w", "shark_h")]
+    zone  = [params.get(k) for k in ("zone_x",  "zone_y",  "zone_w",  "zone_h")]
+    has_shark = all(v is not None for v in shark)
+    has_zone  = all(v is not None for v in zone)
+
+    if has_shark and has_zone:
+        return crop_zone(
+            img,
+            dict(zip("xywh", shark)),
+            dict(zip("xywh", zone)),
+        )
+    if has_shark:
+        return crop_shark_with_auto_zone(img, dict(zip("xywh", shark)), params.get("orientation") or "")
+    return detect_snout(img)
+
+
 @app.get("/health")
 def health():
     return {"status": "ok", "service": "ml", "embeddings": get_store().count()}
@@ -136,28 +162,14 @@ async def classify_image(
     if not data:
         raise HTTPException(status_code=400, detail="Empty image body")
 
-    try:
-        img = Image.open(BytesIO(data))
-    except Exception:
-        raise HTTPException(status_code=422, detail="Cannot decode image")
-
-    has_shark = all(v is not None for v in [shark_x, shark_y, shark_w, shark_h])
-    has_zone  = all(v is not None for v in [zone_x,  zone_y,  zone_w,  zone_h])
-
-    if has_shark and has_zone:
-        region = crop_zone(
-            img,
-            {"x": shark_x, "y": shark_y, "w": shark_w, "h": shark_h},
-            {"x": zone_x,  "y": zone_y,  "w": zone_w,  "h": zone_h},
-        )
-    elif has_shark:
-        region = crop_shark_with_auto_zone(
-            img,
-            {"x": shark_x, "y": shark_y, "w": shark_w, "h": shark_h},
-            orientation or "",
-        )
-    else:
-        region = detect_snout(img)
+    region = _classify_region(
+        _open_image(data),
+        {
+            "shark_x": shark_x, "shark_y": shark_y, "shark_w": shark_w, "shark_h": shark_h,
+            "zone_x": zone_x, "zone_y": zone_y, "zone_w": zone_w, "zone_h": zone_h,
+            "orientation": orientation,
+        },
+    )
 
     embedding = extract_embedding(region)
     candidates = find_candidates(
@@ -166,6 +178,52 @@ async def classify_image(
     return {"candidates": candidates}
 
 
+@app.post("/classify-batch")
+async def classify_batch(request: Request):
+    """Classify several images with a single model inference.
+
+    multipart/form-data with one ``images`` file part per image and a
+    ``params`` field holding a JSON list of per-image query params (same keys
+    as /classify), in the same order.
+
+    Response: {"results": [[candidate, ...] | null, ...]} — one list per
+    image, or null for an image that could not be decoded, so one bad file
+    does not fail the others.
+    """
+    form = await request.form()
+    images = form.getlist("images")
+    try:
+        params = json.loads(form.get("params") or "[]")
+    except ValueError:
+        raise HTTPException(status_code=422, detail="params must be a JSON list")
+    if not isinstance(params, list) or not all(isinstance(p, dict) for p in params):
+        raise HTTPException(status_code=422, detail="params must be a JSON list of objects")
+    if not images:
+        raise HTTPException(status_code=400, detail="No images")
+    if len(params) != len(images):
+        raise HTTPException(status_code=422, detail="params and images differ in length")
+
+    regions = []
+    for upload, p in zip(images, params):
+        data = await upload.read()
+        try:
+            region = _classify_region(Image.open(BytesIO(data)), p)
+            region.load()  # decode now: a truncated file must fail here, not in the batch
+        except Exception:
+            region = None
+        regions.append(region)
+
+    good = [i for i, region in enumerate(regions) if region is not None]
+    results = [None] * len(regions)
+    if good:
+        store = get_store()
+        embeddings = extract_embeddings([regions[i] for i in good])
+        for i, emb in zip(good, embeddings):
+            orientation = params[i].get("orientation") or ""
+            results[i] = find_candidates(emb, store, ML_CONFIDENCE_THRESHOLD, orientation)
+    return {"results": results}
+
+
 @app.post("/embeddings")
 async def store_embedding(
     request: Request,
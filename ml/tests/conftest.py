@@ -35,14 +35,16 @@ def mock_cnn_model(monkeypatch):
             return [_I()]
 
         def run(self, output_names, inputs):
-            arr = list(inputs.values())[0]   # (1, 3, H, W) float32
-            # Downsample to 8×8 then flatten — preserves per-image distinctiveness
-            patch = arr[0].transpose(1, 2, 0)  # (H, W, 3)
-            h, w = patch.shape[:2]
-            step_h, step_w = max(1, h // 8), max(1, w // 8)
-            small = patch[::step_h, ::step_w][:8, :8]  # (8, 8, 3)
-            feat = (small.ravel() @ _W).reshape(1, -1)  # (1, EMBEDDING_DIM)
-            return [feat]
+            arr = list(inputs.values())[0]   # (N, 3, H, W) float32
+            feats = []
+            for sample in arr:
+                # Downsample to 8×8 then flatten — preserves per-image distinctiveness
+                patch = sample.transpose(1, 2, 0)  # (H, W, 3)
+                h, w = patch.shape[:2]
+                step_h, step_w = max(1, h // 8), max(1, w // 8)
+                small = patch[::step_h, ::step_w][:8, :8]  # (8, 8, 3)
+                feats.append(small.ravel() @ _W)
+            return [np.stack(feats)]  # (N, EMBEDDING_DIM)
 
     monkeypatch.setattr(embedder_module, "_session", _StubSession())
 
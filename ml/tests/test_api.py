@@ -109,6 +109,64 @@ def test_classify_invalid_image_returns_422(ml_client):
     assert resp.status_code == 422
 
 
+def test_classify_batch_one_result_per_image(ml_client, jpeg_bytes):
+    ml_client.post(
+        "/embeddings?shark_id=shark-x&display_name=SharkX&photo_id=px",
+        content=jpeg_bytes,
+        headers={"Content-Type": "image/jpeg"},
+    )
+
+    resp = ml_client.post(
+        "/classify-batch",
+        data={"params": '[{}, {"orientation": "left"}]'},
+        files=[
+            ("images", ("a.jpg", jpeg_bytes, "image/jpeg")),
+            ("images", ("b.jpg", jpeg_bytes, "image/jpeg")),
+        ],
+    )
+    assert resp.status_code == 200
+    results = resp.json()["results"]
+    assert len(results) == 2
+    single = ml_client.post("/classify", content=jpeg_bytes, headers={"Content-Type": "image/jpeg"})
+    assert results[0] == single.json()["candidates"]
+
+
+def test_classify_batch_bad_image_fails_alone(ml_client, jpeg_bytes):
+    resp = ml_client.post(
+        "/classify-batch",
+        data={"params": "[{}, {}, {}]"},
+        files=[
+            ("images", ("a.jpg", jpeg_bytes, "image/jpeg")),
+            ("images", ("b.jpg", jpeg_bytes[: len(jpeg_bytes) // 2], "image/jpeg")),
+            ("images", ("c.jpg", b"not an image", "image/jpeg")),
+        ],
+    )
+    assert resp.status_code == 200
+    results = resp.json()["results"]
+    assert isinstance(results[0], list)
+    assert results[1] is None
+    assert results[2] is None
+
+
+def test_classify_batch_params_mismatch_returns_422(ml_client, jpeg_bytes):
+    resp = ml_client.post(
+        "/classify-batch",
+        data={"params": "[]"},
+        files=[("images", ("a.jpg", jpeg_bytes, "image/jpeg"))],
+    )
+    assert resp.status_code == 422
+
+
+@pytest.mark.parametrize("params", ["5", "{}", "[1]"])
+def test_classify_batch_params_not_list_of_objects_returns_422(ml_client, jpeg_bytes, params):
+    resp = ml_client.post(
+        "/classify-batch",
+        data={"params": params},
+        files=[("images", ("a.jpg", jpeg_bytes, "image/jpeg"))],
+    )
+    assert resp.status_code == 422
+
+
 # ── /embeddings ───────────────────────────────────────────────────────────────
 
 
@@ -9,7 +9,7 @@ import numpy as np
 import pytest
 from PIL import Image
 
-from embedder import EMBEDDING_DIM, extract_embedding
+from embedder import EMBEDDING_DIM, extract_embedding, extract_embeddings
 
 
 def test_embedding_dimension(dummy_rgb_image):
@@ -51,3 +51,12 @@ def test_embedding_accepts_rgba_image():
     emb = extract_embedding(img)
     assert emb.shape == (EMBEDDING_DIM,)
     assert abs(np.linalg.norm(emb) - 1.0) < 1e-5
+
+
+def test_batch_embeddings_match_single(dummy_rgb_image):
+    """extract_embeddings returns the same rows as per-image extract_embedding."""
+    red = Image.new("RGB", (64, 64), color=(255, 0, 0))
+    batch = extract_embeddings([dummy_rgb_image, red])
+    assert batch.shape == (2, EMBEDDING_DIM)
+    np.testing.assert_allclose(batch[0], extract_embedding(dummy_rgb_image), rtol=1e-5)
+    np.testing.assert_allclose(batch[1], extract_embedding(red), rtol=1e-5)